@@ -1,122 +1,60 @@
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
 import numpy as np
 import datetime as dt
-from io import BytesIO
-from openpyxl import load_workbook
-import math
-import re
+import functools
+
+from cosmic.audit import AUDIT_CATEGORIES
+from cosmic.chart import chart
+from cosmic.house import house_index
+from cosmic.items import item_catalog
+from cosmic.metrics import cache_lookup, finish_rerun, mark_miss, start_rerun, timed
+from cosmic.placement import plan_house
+from cosmic.profiles import sign_profile
+from cosmic.report import life_audit, sign_details
+from cosmic.timing import day_verdict, guide_rules, scan_dates, strong_days_by_month
+from cosmic.workbook import WorkbookTooLarge, open_snapshot, read_default_workbook, workbook_key
 
 st.set_page_config(page_title="Cosmic Generator", layout="wide")
-
-# --- Optional Swiss Ephemeris ---
-try:
-    import swisseph as swe
-    HAVE_SWE = True
-except Exception:
-    HAVE_SWE = False
-
 # --- Helpers ---
-@st.cache_data(show_spinner=False)
-def load_workbook_bytes(b: bytes):
-    return load_workbook(filename=BytesIO(b), data_only=True)
-
-@st.cache_data(show_spinner=False)
+# Snapshots are shared resources keyed by content hash: a rerun looks them up
+# instead of pickling a Workbook and rebuilding every sheet DataFrame.
+@st.cache_resource(show_spinner=False)
 def load_default_workbook():
-    with open("data/cosmic_generator_v25.xlsx", "rb") as f:
-        return f.read()
-
-def get_sheet_df(wb, name):
-    try:
-        if not wb or name not in wb.sheetnames:
-            return pd.DataFrame()
-        ws = wb[name]
-        rows = list(ws.values)
-        if not rows:
-            return pd.DataFrame()
-        header = rows[0]
-        df = pd.DataFrame(rows[1:], columns=header)
-        return df.dropna(how="all")
-    except Exception:
-        return pd.DataFrame()
-
-ZODIAC = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"]
-
-def sun_sign_from_date(d: dt.date):
-    m, day = d.month, d.day
-    if   (m==3 and day>=21) or (m==4 and day<=19): return "Aries"
-    elif (m==4 and day>=20) or (m==5 and day<=20): return "Taurus"
-    elif (m==5 and day>=21) or (m==6 and day<=20): return "Gemini"
-    elif (m==6 and day>=21) or (m==7 and day<=22): return "Cancer"
-    elif (m==7 and day>=23) or (m==8 and day<=22): return "Leo"
-    elif (m==8 and day>=23) or (m==9 and day<=22): return "Virgo"
-    elif (m==9 and day>=23) or (m==10 and day<=22): return "Libra"
-    elif (m==10 and day>=23) or (m==11 and day<=21): return "Scorpio"
-    elif (m==11 and day>=22) or (m==12 and day<=21): return "Sagittarius"
-    elif (m==12 and day>=22) or (m==1 and day<=19): return "Capricorn"
-    elif (m==1 and day>=20) or (m==2 and day<=18): return "Aquarius"
-    elif (m==2 and day>=19) or (m==3 and day<=20): return "Pisces"
-    return ""
-
-def _rev(x): return x % 360.0
-def moon_longitude_approx_noon_utc(d: dt.date):
-    year, month, day = d.year, d.month, d.day
-    hour = 12.0
-    if month <= 2:
-        year -= 1
-        month += 12
-    A = int(year/100)
-    B = 2 - A + int(A/4)
-    JD = int(365.25*(year + 4716)) + int(30.6001*(month + 1)) + (day + hour/24.0) + B - 1524.5
-    T = (JD - 2451545.0)/36525.0
-    Lp = _rev(218.3164477 + 481267.88123421*T - 0.0015786*T*T)
-    D  = _rev(297.8501921 + 445267.1114034*T - 0.0018819*T*T)
-    M  = _rev(357.5291092 + 35999.0502909*T - 0.0001536*T*T)
-    Mp = _rev(134.9633964 + 477198.8675055*T + 0.0087414*T*T)
-    F  = _rev(93.2720950 + 483202.0175233*T - 0.0036539*T*T)
-    Dr = math.radians(D); Mr = math.radians(M); Mpr = math.radians(Mp); Fr = math.radians(F)
-    lon = (Lp
-        + 6.289 * math.sin(Mpr)
-        + 1.274 * math.sin(2*Dr - Mpr)
-        + 0.658 * math.sin(2*Dr)
-        + 0.214 * math.sin(2*Mpr)
-        - 0.186 * math.sin(Mr)
-        - 0.114 * math.sin(2*Fr)
-        + 0.059 * math.sin(2*Dr - 2*Mpr)
-        + 0.057 * math.sin(2*Dr - Mr - Mpr)
-        + 0.053 * math.sin(2*Dr + Mpr)
-        + 0.046 * math.sin(2*Dr - Mr)
-        + 0.041 * math.sin(Mr + Mpr))
-    return _rev(lon)
-
-def moon_sign_exact(birthdate: dt.date, birthtime: dt.time, tz_offset: float):
-    try:
-        if HAVE_SWE:
-            hour_local = birthtime.hour + birthtime.minute/60 + birthtime.second/3600
-            hour_utc = hour_local - float(tz_offset)
-            jd = swe.julday(birthdate.year, birthdate.month, birthdate.day, hour_utc)
-            pos = swe.calc_ut(jd, swe.MOON)[0]
-            lon = float(pos[0])
-            idx = int(lon // 30) % 12
-            return ZODIAC[idx], lon, True
-        lon = moon_longitude_approx_noon_utc(birthdate)
-        idx = int(lon // 30) % 12
-        return ZODIAC[idx], lon, False
-    except Exception:
-        lon = moon_longitude_approx_noon_utc(birthdate)
-        idx = int(lon // 30) % 12
-        return ZODIAC[idx], lon, False
-
-def universal_day_number(d: dt.date, keep_master=True):
-    s = d.strftime("%Y%m%d")
-    n = sum(int(ch) for ch in s)
-    if keep_master and n in (11, 22, 33):
-        return n
-    return 9 if n % 9 == 0 else n % 9
-
-def weekday_name(d: dt.date):
-    return d.strftime("%A")
+    mark_miss()
+    raw = read_default_workbook()
+    return workbook_key(raw), raw
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def load_snapshot(key: str, _raw: bytes):
+    mark_miss()
+    return open_snapshot(_raw, key)
+
+def upload_key(uploaded):
+    # hash each upload once per session, not on every rerun
+    keys = st.session_state.setdefault("upload_keys", {})
+    if uploaded.file_id not in keys:
+        keys[uploaded.file_id] = workbook_key(uploaded.getvalue())
+    return keys[uploaded.file_id]
+
+# Per-view results memoized on the widget values they depend on; the snapshot
+# itself is unhashed and identified by its content key.
+@st.cache_data(show_spinner=False, max_entries=256)
+def birth_chart(birthdate, birthtime, tz_offset):
+    mark_miss()
+    return chart(birthdate, birthtime, tz_offset)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def audit_results(key: str, _snapshot, sign: str, texts: tuple):
+    mark_miss()
+    return life_audit(_snapshot, sign, dict(texts))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def scan_results(key: str, _snapshot, activities: tuple, start, end, keep_master: bool):
+    mark_miss()
+    return scan_dates(guide_rules(_snapshot), list(activities), start, end, keep_master=keep_master)
 
 def safe_unique_list(series):
     try:
@@ -124,30 +62,45 @@ def safe_unique_list(series):
     except Exception:
         return []
 
-# --- Sidebar ---
-st.sidebar.title("Data Source")
-uploaded = st.sidebar.file_uploader("Upload a Cosmic Generator workbook (.xlsx)", type=["xlsx"])
-keep_master = st.sidebar.checkbox("Numerology: Keep master numbers (11/22/33)?", value=True)
-st.session_state["keep_master"] = keep_master
-
-raw = uploaded.getvalue() if uploaded else load_default_workbook()
-wb = load_workbook_bytes(raw) if raw else None
-
-# Load sheets
-df_data         = get_sheet_df(wb, "Data")
-df_audit        = get_sheet_df(wb, "AuditData")
-df_elem_items   = get_sheet_df(wb, "Element_Items")
-df_zones        = get_sheet_df(wb, "House_Zones")
-df_rel          = get_sheet_df(wb, "Element_Relations")
-df_pref         = get_sheet_df(wb, "Element_Preferences")
-df_shapes       = get_sheet_df(wb, "Shape_Elements")
-df_guide        = get_sheet_df(wb, "Activity_Day_Guide")
-
-# Tabs
-tabs = st.tabs(["Inputs", "Life Audit", "Activity Timing", "House Zone Checker", "Items Browser"])
+def render_timings(run):
+    st.caption(f"{run.label or 'Rerun'}: {run.seconds * 1000:.1f} ms")
+    spans = pd.DataFrame([(n, c, t * 1000, m * 1000) for n, c, t, m in run.span_rows()],
+                         columns=["Span", "Calls", "Total ms", "Max ms"])
+    st.dataframe(spans.sort_values("Total ms", ascending=False), hide_index=True, use_container_width=True)
+    caches = pd.DataFrame(run.cache_rows(), columns=["Cache", "Hits", "Misses"])
+    st.dataframe(caches, hide_index=True, use_container_width=True)
+
+def view(name):
+    """Tab body as a fragment, timed as tab.<name>.
+
+    A fragment-only rerun (told apart by the script run context) skips the
+    page's start_rerun(), so it gets its own Rerun (labelled fragment.<name>) and, with the debug panel on, shows
+    its timings at the bottom of the tab.
+    """
+    def wrap(fn):
+        body = timed(f"tab.{name}")(fn)
+
+        @st.fragment
+        @functools.wraps(fn)
+        def fragment(*args, **kwargs):
+            ctx = get_script_run_ctx()
+            if not (ctx and ctx.fragment_ids_this_run):
+                return body(*args, **kwargs)
+            run = start_rerun(f"fragment.{name}")
+            try:
+                result = body(*args, **kwargs)
+            finally:
+                finish_rerun(run)
+            if st.session_state.get("show_timings"):
+                with st.expander("Timings (this fragment rerun)"):
+                    render_timings(run)
+            return result
+        return fragment
+    return wrap
 
 # ===== Inputs =====
-with tabs[0]:
+@view("inputs")
+def inputs_view(snapshot):
     st.subheader("Inputs")
     birthdate = st.date_input("Birthdate", dt.date(1990,1,1))
     birthtime = st.time_input("Birth time (local)", dt.time(12,0))
@@ -184,135 +137,55 @@ with tabs[0]:
     tz_choice = st.selectbox("Timezone (pick closest)", tz_labels, index=7)
     tz_offset = tz_map.get(tz_choice, 0.0)
 
-    sun_sign = sun_sign_from_date(birthdate) or ""
-    moon_sign, moon_lon, used_exact = moon_sign_exact(birthdate, birthtime, tz_offset)
+    with cache_lookup("view.birth_chart"):
+        placements = birth_chart(birthdate, birthtime, tz_offset)
+    sun_sign, moon_sign = placements["Sun"].sign, placements["Moon"].sign
+    used_exact = placements["Moon"].exact
     st.info(f"Sun: {sun_sign or '—'} | Moon: {moon_sign or '—'} {'(exact)' if used_exact else '(approx)'} | TZ: {tz_choice}")
+    with st.expander("Birth chart"):
+        st.dataframe(pd.DataFrame([(p.body, p.sign, round(p.longitude, 2), "exact" if p.exact else "approx")
+                                   for p in placements.values()],
+                                  columns=["Body", "Sign", "Longitude (°)", "Source"]),
+                     use_container_width=True, hide_index=True)
 
     use_choice = st.radio("Use which sign across the app?", ["Sun","Moon"], horizontal=True)
     selected_sign = sun_sign if use_choice=="Sun" else moon_sign
+    previous = st.session_state.get("selected_sign")
     st.session_state["selected_sign"] = selected_sign
+    if previous is not None and previous != selected_sign:
+        st.rerun()  # the other views read the sign; refresh them once
 
-    if not df_data.empty and "Astrological Sign" in df_data.columns and selected_sign:
-        row = df_data.loc[df_data["Astrological Sign"]==selected_sign]
-        if not row.empty:
-            info = row.iloc[0].to_dict()
-            info_clean = {k: v for k,v in info.items() if pd.notna(v) and str(v) != ""}
-            df_show = pd.DataFrame(list(info_clean.items()), columns=["Field","Value"])
-            st.write("**Sign Details (from Data sheet):**")
-            st.dataframe(df_show, use_container_width=True, hide_index=True)
+    info_clean = sign_details(snapshot, selected_sign) if selected_sign else {}
+    if info_clean:
+        df_show = pd.DataFrame(list(info_clean.items()), columns=["Field","Value"])
+        st.write("**Sign Details (from Data sheet):**")
+        st.dataframe(df_show, use_container_width=True, hide_index=True)
 
 # ===== Life Audit (v9 matching) =====
-with tabs[1]:
+@view("life_audit")
+def life_audit_view(snapshot):
     st.subheader("Life Audit – Conflicts & Remedies")
     selected_sign = st.session_state.get("selected_sign","")
     if not selected_sign:
         st.warning("Go to Inputs and choose Sun or Moon first.")
     st.caption("Comma-separated lists. Smarter matching with phrases and word boundaries.")
 
-    config = [
-        ("Colours / Décor", "Avoid Household (strong)", "Avoid Household (mild)", "Colour", "Household Items", "general"),
-        ("Foods", "Avoid Foods (strong)", "Avoid Foods (mild)", "Foods", "Foods", "general"),
-        ("Crystals & Gemstones", "Avoid Crystals (strong)", "Avoid Crystals (mild)", "Primary Crystals", "Alternative Crystals / Gemstones", "general"),
-        ("Activities", "Avoid Activities (strong)", "Avoid Activities (mild)", "Favorable Activities", "Favorable Activities", "names_only"),
-        ("Elements", "Avoid Elements (strong)", "Avoid Elements (mild)", "Element", "Element", "general"),
-        ("People (Signs)", "Enemy Signs (strong)", "Enemy Signs (mild)", None, None, "names_only"),
-    ]
+    df_audit = snapshot.sheet("AuditData")
+    profile = sign_profile(snapshot, selected_sign)
+    has_rules = profile is not None and bool(profile.matchers)
 
-    def tokenize(user_text, mode):
-        if not user_text: return []
-        # split only on commas/newlines; keep phrases
-        parts = re.split(r"[,\\n]", user_text)
-        tokens = []
-        for p in parts:
-            t = re.sub(r"\s+", " ", p.strip().lower())
-            if t:
-                tokens.append(t)
-        return tokens
-
-    def normalize_list(csv_str):
-        if not csv_str: return []
-        terms = [re.sub(r"\s+", " ", x.strip().lower()) for x in str(csv_str).split(",")]
-        return [t for t in terms if t]
-
-    def match_token(tok, strong_terms, mild_terms):
-        # exact first
-        if tok in strong_terms: return "STRONG", tok
-        if tok in mild_terms:   return "MILD", tok
-        # word-boundary contains: token in term or term in token
-        for term in strong_terms:
-            if re.search(rf"\\b{re.escape(tok)}\\b", term) or re.search(rf"\\b{re.escape(term)}\\b", tok):
-                return "STRONG", term
-        for term in mild_terms:
-            if re.search(rf"\\b{re.escape(tok)}\\b", term) or re.search(rf"\\b{re.escape(term)}\\b", tok):
-                return "MILD", term
-        # fallback substring (less strict)
-        for term in strong_terms:
-            if tok in term or term in tok:
-                return "STRONG", term
-        for term in mild_terms:
-            if tok in term or term in tok:
-                return "MILD", term
-        return "OK", ""
-
-    results_rows = []
-    summary_rows = []
-
-    for (label, col_strong, col_mild, rem1, rem2, mode) in config:
-        user_text = st.text_area(f"My {label}", key=f"la9_{label}", height=60, placeholder="e.g., blue, rose gold, marble" if mode!="names_only" else "e.g., Aries, Scorpio")
-        tokens = tokenize(user_text, mode)
+    texts = {}
+    for (label, col_strong, col_mild, rem1, rem2, mode) in AUDIT_CATEGORIES:
+        texts[label] = st.text_area(f"My {label}", key=f"la9_{label}", height=60, placeholder="e.g., blue, rose gold, marble" if mode!="names_only" else "e.g., Aries, Scorpio")
 
         if df_audit.empty or "Astrological Sign" not in df_audit.columns:
             st.caption(f"_No rules found for {label} (AuditData missing)._")
-            continue
-        row = df_audit.loc[df_audit["Astrological Sign"]==selected_sign]
-        if row.empty:
+        elif not has_rules:
             st.caption(f"_No rules for {selected_sign} in {label}._")
-            continue
-
-        strong_terms = normalize_list(row.iloc[0].get(col_strong, ""))
-        mild_terms   = normalize_list(row.iloc[0].get(col_mild, ""))
-
-        strong_hits = mild_hits = 0
-        if tokens:
-            for tok in tokens:
-                verdict, src = match_token(tok, strong_terms, mild_terms)
-                if verdict=="STRONG": strong_hits += 1
-                elif verdict=="MILD": mild_hits += 1
-                results_rows.append((label, tok, verdict, src))
-        else:
-            results_rows.append((label, "", "OK", ""))
-
-        fixes = []
-        # Pull remedies from Data sheet if present
-        if not df_data.empty and "Astrological Sign" in df_data.columns:
-            drow = df_data.loc[df_data["Astrological Sign"]==selected_sign]
-            if not drow.empty:
-                drow = drow.iloc[0]
-                if strong_hits>0:
-                    if label=="Colours / Décor" and "Colour" in drow:
-                        fixes.append(f"Switch to favourable colours: {drow['Colour']}")
-                    if label=="Foods" and "Foods" in drow:
-                        fixes.append(f"Prioritize: {drow['Foods']}")
-                    if label=="Crystals & Gemstones":
-                        if "Primary Crystals" in drow: fixes.append(f"Carry/wear: {drow['Primary Crystals']}")
-                        if "Alternative Crystals / Gemstones" in drow: fixes.append(f"Alternate set: {drow['Alternative Crystals / Gemstones']}")
-                    if label=="Activities" and "Favorable Activities" in drow:
-                        fixes.append(f"Swap to: {drow['Favorable Activities']}")
-                    if label=="Elements" and "Element" in drow:
-                        fixes.append(f"Emphasize {drow['Element']} items")
-                    if label=="People (Signs)":
-                        fixes.append("Reduce strong enemy-sign dynamics; choose neutral/shared-element activities")
-                elif mild_hits>0:
-                    if label in ("Colours / Décor","Elements","Crystals & Gemstones"):
-                        fixes.append("Balance with supportive colours/crystals of your element")
-                    if label=="Foods":
-                        fixes.append("Moderate intake; avoid combos with other flagged foods")
-                    if label=="Activities":
-                        fixes.append("Do on a favourable weekday/number to offset mild conflicts")
-                    if label=="People (Signs)":
-                        fixes.append("Choose neutral settings; keep interactions short")
-        fixes = fixes[:3]
-        summary_rows.append((label, strong_hits, mild_hits, ", ".join(fixes)))
+
+    # Remedies come from the Data sheet row of the selected sign
+    with cache_lookup("view.life_audit"), timed("life_audit"):
+        results_rows, summary_rows = audit_results(snapshot.key, snapshot, selected_sign, tuple(texts.items()))
 
     # Render results
     colA, colB = st.columns([2,1])
@@ -328,39 +201,56 @@ with tabs[1]:
             st.dataframe(df_sum, use_container_width=True)
 
 # ===== Activity Timing =====
-with tabs[2]:
+@view("activity_timing")
+def timing_view(snapshot):
     st.subheader("Activity Timing – Astrology x Numerology")
+    df_guide = snapshot.sheet("Activity_Day_Guide")
     if df_guide.empty:
         st.warning("Activity_Day_Guide sheet not found in workbook.")
     else:
         activities = safe_unique_list(df_guide["Activity"]) if "Activity" in df_guide.columns else []
-        activity = st.selectbox("Activity", activities) if activities else ""
-        date = st.date_input("Planned Date", dt.date.today())
-        if activity:
-            row = df_guide.loc[df_guide["Activity"]==activity]
-            if row.empty:
-                st.warning("Selected activity not found in guide."); 
-            else:
-                row = row.iloc[0]
-                wd = weekday_name(date)
-                ud = universal_day_number(date, keep_master=st.session_state.get("keep_master", True))
-                good_days = str(row.get("Good Days (Astrology)",""))
-                avoid_days = str(row.get("Avoid Days (Astrology)",""))
-                good_nums = str(row.get("Good Numbers (Numerology)",""))
-                avoid_nums = str(row.get("Avoid Numbers (Numerology)",""))
-                notes = str(row.get("Synergy Notes",""))
-                afit = "Yes" if wd in good_days else ("No" if wd in avoid_days else "Maybe")
-                nfit = "Yes" if str(ud) in good_nums else ("No" if str(ud) in avoid_nums else "Maybe")
-                verdict = "Strong Cosmic Timing" if (afit=="Yes" and nfit=="Yes") else ("Weak / Reschedule Suggested" if ("No" in (afit,nfit)) else "Moderate Timing")
-                st.write(f"Weekday: {wd}   |   Universal Day: {ud}")
-                st.write(f"Astrology Fit: {afit}   |   Numerology Fit: {nfit}")
-                st.write(f"Overall Verdict: {verdict}")
-                if notes:
-                    st.info(notes)
+        rules = guide_rules(snapshot)
+        keep_master = st.session_state.get("keep_master", True)
+        mode = st.radio("Mode", ["Single date", "Find best dates"], horizontal=True)
+        if mode == "Single date":
+            activity = st.selectbox("Activity", activities) if activities else ""
+            date = st.date_input("Planned Date", dt.date.today())
+            if activity:
+                rule = rules.get(activity)
+                if rule is None:
+                    st.warning("Selected activity not found in guide."); 
+                else:
+                    wd, ud, afit, nfit, verdict = day_verdict(rule, date, keep_master=keep_master)
+                    st.write(f"Weekday: {wd}   |   Universal Day: {ud}")
+                    st.write(f"Astrology Fit: {afit}   |   Numerology Fit: {nfit}")
+                    st.write(f"Overall Verdict: {verdict}")
+                    if rule.notes:
+                        st.info(rule.notes)
+        else:
+            chosen = st.multiselect("Activities", activities, default=activities[:1])
+            today = dt.date.today()
+            col1, col2 = st.columns(2)
+            with col1:
+                start = st.date_input("From", today, key="scan_from")
+            with col2:
+                end = st.date_input("To", today + dt.timedelta(days=365), key="scan_to")
+            if chosen and start <= end:
+                with cache_lookup("view.scan"):
+                    scan = scan_results(snapshot.key, snapshot, tuple(chosen), start, end, keep_master)
+                strong = scan[scan["Score"] == 2]
+                st.write(f"**{len(strong)} Strong Cosmic Timing dates** between {start} and {end}")
+                st.dataframe(strong.drop(columns="Score").head(200), use_container_width=True, hide_index=True)
+                st.write("**Strong dates per month**")
+                st.dataframe(strong_days_by_month(scan), use_container_width=True)
 
 # ===== House Zone Checker =====
-with tabs[3]:
+@view("house_zone")
+def house_view(snapshot):
     st.subheader("House Zone Checker – 5 Elements + Space (with Shapes)")
+    df_elem_items = snapshot.sheet("Element_Items")
+    df_zones = snapshot.sheet("House_Zones")
+    df_rel = snapshot.sheet("Element_Relations")
+    df_shapes = snapshot.sheet("Shape_Elements")
     if df_elem_items.empty or df_zones.empty or df_rel.empty:
         st.warning("Missing one of: Element_Items, House_Zones, Element_Relations sheets.")
     else:
@@ -379,53 +269,9 @@ with tabs[3]:
             shape = st.selectbox("Shape (optional)", choices, index=idx)
 
         if item and zone:
-            try:
-                item_elem = df_elem_items.loc[df_elem_items["Item Name"]==item].iloc[0]["Element"]
-            except Exception:
-                item_elem = ""
-            try:
-                zone_elem = df_zones.loc[df_zones["Zone"]==zone].iloc[0]["Primary Element"]
-            except Exception:
-                zone_elem = ""
-            zone_primary = str(zone_elem).split("+")[0].strip() if zone_elem else ""
-
-            rel = "Neutral"
-            try:
-                row = df_rel[df_rel.iloc[:,0]==item_elem]
-                if not row.empty and zone_primary in row.columns:
-                    rel = row.iloc[0][zone_primary]
-            except Exception:
-                pass
-
-            remedy = "OK / Supportive — keep as is"
-            if zone == "Centre" and item_elem != "Space":
-                remedy = "Keep centre open — relocate item to its best zones"
-            elif isinstance(rel, str) and rel.startswith("Avoid"):
-                if not df_pref.empty:
-                    rowp = df_pref.loc[df_pref["Element"]==item_elem]
-                    best = str(rowp.iloc[0]["Best Zones"]) if not rowp.empty else ""
-                    remedy = f"Move to: {best}"
-                else:
-                    remedy = "Move to a better-suited zone for the item's element"
-            elif rel == "Mild Avoid":
-                remedy = "Balance with supportive colours/crystals of the zone element or relocate later"
-
-            shape_elem = ""
-            shape_rel = ""
-            rec_shapes = ""
-            if shape and not df_shapes.empty:
-                srow = df_shapes.loc[df_shapes["Shape"]==shape]
-                if not srow.empty:
-                    shape_elem = str(srow.iloc[0]["Element"])
-                    try:
-                        rrow = df_rel[df_rel.iloc[:,0]==shape_elem]
-                        if not rrow.empty and zone_primary in rrow.columns:
-                            shape_rel = rrow.iloc[0][zone_primary]
-                    except Exception:
-                        shape_rel = ""
-                rec_list = df_shapes.loc[df_shapes["Element"]==zone_primary]["Shape"].dropna().tolist() if zone_primary else []
-                if rec_list:
-                    rec_shapes = ", ".join(rec_list[:10])
+            v = house_index(snapshot).verdict(item, zone, shape)
+            item_elem, zone_primary, rel, remedy = v.item_elem, v.zone_primary, v.relation, v.remedy
+            shape_elem, shape_rel, rec_shapes = v.shape_elem, v.shape_relation, v.recommended_shapes
 
             st.write(f"Item Element: {item_elem or '—'}   |   Zone Element (Primary): {zone_primary or '—'}")
             st.write(f"Verdict: {rel}")
@@ -435,22 +281,97 @@ with tabs[3]:
             if rec_shapes:
                 st.caption(f"Recommended shapes for this zone: {rec_shapes}")
 
+        with st.expander("Whole-house compatibility (all items × all zones)"):
+            st.dataframe(house_index(snapshot).compatibility_matrix(items, zones), use_container_width=True)
+
+        with st.expander("Whole-house placement"):
+            inventory = st.multiselect("Household inventory", items, key="plan_items")
+            col1, col2 = st.columns(2)
+            with col1:
+                per_zone = st.number_input("Max items per zone (0 = no limit)", min_value=0, value=0, step=1)
+            with col2:
+                keep_centre = st.checkbox("Keep Centre open", value=True)
+            if inventory:
+                try:
+                    plan = plan_house(snapshot, inventory, per_zone or None, keep_centre)
+                except ValueError as e:
+                    st.warning(str(e))
+                else:
+                    st.dataframe(plan, use_container_width=True, hide_index=True)
+                    st.caption("Relations: " + ", ".join(f"{k}: {v}" for k, v in plan["Relation"].value_counts().items()))
+
 # ===== Items Browser =====
-with tabs[4]:
+@view("items_browser")
+def items_view(snapshot):
     st.subheader("Element Items Browser")
-    if df_elem_items.empty:
+    if snapshot.sheet("Element_Items").empty:
         st.warning("Element_Items sheet missing.")
     else:
-        elems = ["All"] + safe_unique_list(df_elem_items["Element"]) if "Element" in df_elem_items.columns else ["All"]
-        cats  = ["All"] + safe_unique_list(df_elem_items["Category"]) if "Category" in df_elem_items.columns else ["All"]
-        col1, col2 = st.columns(2)
+        catalog = item_catalog(snapshot)
+        elems = ["All"] + catalog.options.get("Element", [])
+        cats  = ["All"] + catalog.options.get("Category", [])
+        col1, col2, col3 = st.columns(3)
         with col1:
             fe = st.selectbox("Element", elems, index=0)
         with col2:
             fc = st.selectbox("Category", cats, index=0)
-        df_view = df_elem_items.copy()
-        if "Element" in df_view.columns and fe != "All":
-            df_view = df_view[df_view["Element"]==fe]
-        if "Category" in df_view.columns and fc != "All":
-            df_view = df_view[df_view["Category"]==fc]
-        st.dataframe(df_view.reset_index(drop=True), use_container_width=True)
+        with col3:
+            query = st.text_input("Search item names", key="items_query")
+        rows = catalog.filter(fe, fc, query)
+        col1, col2 = st.columns(2)
+        with col1:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+        n_pages = max(1, -(-len(rows) // page_size))
+        with col2:
+            page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+        start = (page - 1) * page_size
+        st.caption(f"Showing {min(start + 1, len(rows))}–{min(start + page_size, len(rows))} of {len(rows)} items")
+        st.dataframe(catalog.page(rows, page, page_size).reset_index(drop=True), use_container_width=True)
+
+# ===== Page =====
+# The page runs under try/finally: st.rerun() and widget-change interruptions
+# end a run by raising, and the rerun must still be recorded.
+rerun = start_rerun()
+try:
+    # --- Sidebar ---
+    st.sidebar.title("Data Source")
+    uploaded = st.sidebar.file_uploader("Upload a Cosmic Generator workbook (.xlsx)", type=["xlsx"])
+    keep_master = st.sidebar.checkbox("Numerology: Keep master numbers (11/22/33)?", value=True)
+    show_timings = st.sidebar.checkbox("Show timing debug panel", value=False, key="show_timings")
+    st.session_state["keep_master"] = keep_master
+
+    snapshot = None
+    with cache_lookup("snapshot.memory"):
+        if uploaded:
+            # remember rejections so an oversized upload is not re-read on every rerun
+            rejected = st.session_state.setdefault("rejected_uploads", {})
+            key = upload_key(uploaded)
+            if key not in rejected:
+                try:
+                    snapshot = load_snapshot(key, uploaded.getvalue())
+                except WorkbookTooLarge as e:
+                    rejected[key] = str(e)
+            if key in rejected:
+                st.error(f"{rejected[key]} Showing the bundled workbook instead.")
+        if snapshot is None:
+            snapshot = load_snapshot(*load_default_workbook())
+
+    # Tabs
+    tabs = st.tabs(["Inputs", "Life Audit", "Activity Timing", "House Zone Checker", "Items Browser"])
+    with tabs[0]:
+        inputs_view(snapshot)
+    with tabs[1]:
+        life_audit_view(snapshot)
+    with tabs[2]:
+        timing_view(snapshot)
+    with tabs[3]:
+        house_view(snapshot)
+    with tabs[4]:
+        items_view(snapshot)
+finally:
+    finish_rerun(rerun)
+
+# ===== Timing debug panel =====
+if show_timings:
+    with st.sidebar.expander("Timings (this rerun)", expanded=True):
+        render_timings(rerun)
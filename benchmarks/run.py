@@ -0,0 +1,274 @@
+"""Benchmarks for the app's hot paths, checked against stored baselines.
+
+    python benchmarks/run.py                  # run all, fail on regressions
+    python benchmarks/run.py -k audit         # only names containing "audit"
+    python benchmarks/run.py --update         # rewrite baseline.json
+
+Each benchmark reports the best per-call time over several repeats. Ratios
+to the baseline are divided by the run's median ratio, so a machine that is
+busier or slower across the board doesn't read as a regression (with fewer
+than MIN_FOR_MEDIAN benchmarks compared, e.g. under a narrow -k, raw ratios
+are used). A benchmark is flagged
+when its ratio exceeds --threshold (default 1.5x) widened by its own noise
+(how far the median repeat sits above the best), and a flag only fails the
+run (exit 1) if it holds on --retries longer re-measurements. Baselines are
+machine specific: regenerate them with --update on the machine that runs
+the check. The on-disk sheet cache goes to a temporary directory that is
+removed when the run ends.
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import synthetic_workbook  # noqa: E402
+from cosmic import astro  # noqa: E402
+from cosmic.audit import TermMatcher, match_token  # noqa: E402
+from cosmic.chart import _placement, chart, charts  # noqa: E402
+from cosmic.compat import compat_index  # noqa: E402
+from cosmic.house import HouseIndex  # noqa: E402
+from cosmic.report import life_audit  # noqa: E402
+from cosmic.timing import build_guide_rules, date_range, scan_dates, universal_day_numbers  # noqa: E402
+from cosmic.workbook import SHEETS, build_snapshot, get_sheet_df, load_workbook_bytes, open_snapshot, read_default_workbook  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BENCHMARKS = {}
+MIN_FOR_MEDIAN = 5  # below this, one regression would move the median itself
+
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+# Each registered function does its setup and returns the callable to time.
+
+def _load_all_sheets(raw):
+    wb = load_workbook_bytes(raw)
+    return [get_sheet_df(wb, name) for name in SHEETS]
+
+
+@benchmark("workbook.load_sheets.bundled")
+def _():
+    raw = read_default_workbook()
+    return lambda: _load_all_sheets(raw)
+
+
+@benchmark("workbook.load_sheets.synthetic_10x")
+def _():
+    raw = synthetic_workbook(10)
+    return lambda: _load_all_sheets(raw)
+
+
+@benchmark("workbook.open_snapshot.disk_cache_10x")
+def _():
+    raw = synthetic_workbook(10)
+    open_snapshot(raw)
+    return lambda: open_snapshot(raw)
+
+
+def _terms(n, prefix):
+    return [f"{prefix} term {i}" for i in range(n)]
+
+
+def _tokens(n):
+    return [f"user item {i}" for i in range(n)]
+
+
+for _n in (10, 100):
+    @benchmark(f"audit.match_token.{_n}x{_n}")
+    def _(n=_n):
+        strong, mild, tokens = _terms(n, "strong"), _terms(n, "mild"), _tokens(n)
+        return lambda: [match_token(t, strong, mild) for t in tokens]
+
+    @benchmark(f"audit.matcher.{_n}x{_n}")
+    def _(n=_n):
+        matcher, tokens = TermMatcher(_terms(n, "strong"), _terms(n, "mild")), _tokens(n)
+        return lambda: [matcher.match(t) for t in tokens]
+
+
+@benchmark("report.life_audit.6_categories")
+def _():
+    snapshot = build_snapshot(read_default_workbook())
+    texts = {
+        "Colours / Décor": "red, navy blue, rose gold, marble, black",
+        "Foods": "melon juice, green beans, bread, coffee, spicy curry",
+        "Crystals & Gemstones": "amethyst, ruby, jade, onyx",
+        "Elements": "Fire, Water",
+        "Activities": "running, swimming, late nights",
+        "People (Signs)": "Cancer, Leo, Aries",
+    }
+    life_audit(snapshot, "Leo", texts)
+    return lambda: life_audit(snapshot, "Leo", texts)
+
+
+@benchmark("compat.group.500_people")
+def _():
+    index = compat_index(build_snapshot(read_default_workbook()))
+    signs = list(np.random.default_rng(0).choice(astro.ZODIAC, 500))
+    return lambda: index.group(signs)
+
+
+@benchmark("astro.moon_sign_exact.table")
+def _():
+    return lambda: astro.moon_sign_exact(dt.date(1990, 1, 1), dt.time(8, 30), 5.5)
+
+
+if astro.HAVE_SWE:
+    @benchmark("astro.moon_sign_exact.swe")
+    def _():
+        # before the ingress table's range, so Swiss Ephemeris is used
+        return lambda: astro.moon_sign_exact(dt.date(1850, 1, 1), dt.time(8, 30), 5.5)
+
+
+@benchmark("astro.moon_longitude_approx_noon_utc")
+def _():
+    return lambda: astro.moon_longitude_approx_noon_utc(dt.date(1990, 1, 1))
+
+
+@benchmark("astro.moon_signs.bulk_10k")
+def _():
+    rng = np.random.default_rng(0)
+    dates = np.datetime64("1950-01-01") + rng.integers(0, 365 * 70, 10_000).astype("timedelta64[D]")
+    times = rng.integers(0, 1440, 10_000) / 60.0
+    return lambda: astro.moon_signs(dates, times, 5.5)
+
+
+@benchmark("chart.chart.uncached")
+def _():
+    def run():
+        _placement.cache_clear()
+        return chart(dt.date(1990, 1, 1), dt.time(8, 30), 5.5)
+    return run
+
+
+@benchmark("chart.charts.bulk_10k")
+def _():
+    rng = np.random.default_rng(0)
+    dates = np.datetime64("1950-01-01") + rng.integers(0, 365 * 70, 10_000).astype("timedelta64[D]")
+    times = rng.integers(0, 1440, 10_000) / 60.0
+    return lambda: charts(dates, times, 5.5)
+
+
+@benchmark("timing.universal_day_number.1y_scalar")
+def _():
+    days = [dt.date(2026, 1, 1) + dt.timedelta(days=i) for i in range(365)]
+    return lambda: [astro.universal_day_number(d) for d in days]
+
+
+@benchmark("timing.universal_day_numbers.100y")
+def _():
+    dates = date_range(dt.date(2000, 1, 1), dt.date(2099, 12, 31))
+    return lambda: universal_day_numbers(dates)
+
+
+@benchmark("timing.scan_dates.20_activities_10y")
+def _():
+    from benchmarks.synthetic import guide_rows
+    import pandas as pd
+    rows = guide_rows(20)
+    rules = build_guide_rules(pd.DataFrame(rows[1:], columns=rows[0]))
+    return lambda: scan_dates(rules, list(rules), dt.date(2026, 1, 1), dt.date(2035, 12, 31))
+
+
+def _house_index(scale):
+    snapshot = build_snapshot(synthetic_workbook(scale) if scale > 1 else read_default_workbook())
+    return HouseIndex.from_snapshot(snapshot)
+
+
+@benchmark("house.verdict")
+def _():
+    index = _house_index(1)
+    return lambda: index.verdict("Candle", "North (N)", "Circle")
+
+
+@benchmark("house.compatibility_matrix.10x")
+def _():
+    index = _house_index(10)
+    return lambda: index.compatibility_matrix()
+
+
+def measure(fn, repeat=7):
+    """(best per-call seconds, noise): noise is the median repeat's excess over the best."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = sorted(timer.repeat(repeat=repeat, number=number))
+    best = times[0] / number
+    return best, times[len(times) // 2] / times[0] - 1.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown vs baseline")
+    parser.add_argument("--retries", type=int, default=2, help="re-measure flagged benchmarks this many times")
+    parser.add_argument("--update", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="cosmic-bench-") as cache_dir:
+        os.environ["COSMIC_CACHE_DIR"] = cache_dir
+        return run(args)
+
+
+def run(args):
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+
+    fns, results, noise = {}, {}, {}
+    for name, setup in BENCHMARKS.items():
+        if args.pattern in name:
+            fns[name] = setup()
+            results[name], noise[name] = measure(fns[name], args.repeat)
+
+    def ratios():
+        return {name: t / baseline[name] for name, t in results.items() if baseline.get(name)}
+
+    raw = ratios()
+    scale = float(np.median(list(raw.values()))) if len(raw) >= MIN_FOR_MEDIAN else 1.0
+    slow = {name for name, r in raw.items() if r / scale > args.threshold * (1.0 + noise[name])}
+    for _ in range(args.retries):
+        if not slow:
+            break
+        for name in slow:
+            # more repeats than the first pass: a best-of-3 is easily caught by one busy moment
+            t, n = measure(fns[name], 3 * max(args.repeat, 7))
+            if t < results[name]:
+                results[name], noise[name] = t, n
+        raw = ratios()
+        slow = {name for name in slow if raw[name] / scale > args.threshold * (1.0 + noise[name])}
+
+    print(f"{'(median ratio, divided out below)':45s} {'':15s} {scale:5.2f}x")
+    for name, t in results.items():
+        shown = f"{raw[name] / scale:5.2f}x" if name in raw else "  new"
+        print(f"{name:45s} {t * 1e6:12.1f} us  {shown}{'  REGRESSION' if name in slow else ''}")
+
+    if args.update:
+        # a partial update is stored at the scale of the rest of the baseline
+        factor = scale if args.pattern else 1.0
+        baseline.update({name: t / factor for name, t in results.items()})
+        with open(BASELINE, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {BASELINE}")
+        return 0
+    if slow:
+        failures = [name for name in results if name in slow]
+        print(f"{len(failures)} benchmark(s) regressed beyond {args.threshold}x: {', '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
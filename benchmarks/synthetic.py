@@ -0,0 +1,53 @@
+"""Synthetic Cosmic Generator workbooks for benchmarks.
+
+``synthetic_workbook(scale)`` returns xlsx bytes with every sheet the app
+reads repeated ``scale`` times (names made unique where they are keys), plus
+an Activity_Day_Guide sheet, which the bundled workbook lacks.
+"""
+import random
+from io import BytesIO
+
+from openpyxl import Workbook, load_workbook
+
+from cosmic.timing import WEEKDAYS
+from cosmic.workbook import SHEETS, read_default_workbook
+
+# sheets whose first column must stay unique when rows are repeated
+_UNIQUE_KEY = {"Element_Items": "Item Name", "Shape_Elements": "Shape"}
+
+
+def guide_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = [("Activity", "Good Days (Astrology)", "Avoid Days (Astrology)",
+             "Good Numbers (Numerology)", "Avoid Numbers (Numerology)", "Synergy Notes")]
+    for i in range(n):
+        days = rng.sample(WEEKDAYS, 3)
+        nums = rng.sample(range(1, 10), 3)
+        rows.append((f"Activity {i}", ", ".join(days[:2]), days[2],
+                     ", ".join(map(str, nums[:2])), str(nums[2]), f"Notes for activity {i}"))
+    return rows
+
+
+def synthetic_workbook(scale=10, seed=0):
+    src = load_workbook(BytesIO(read_default_workbook()), data_only=True)
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name in SHEETS:
+        ws = wb.create_sheet(name)
+        if name == "Activity_Day_Guide":
+            for row in guide_rows(20 * scale, seed):
+                ws.append(row)
+            continue
+        rows = list(src[name].values)
+        header, body = rows[0], rows[1:]
+        ws.append(header)
+        key = header.index(_UNIQUE_KEY[name]) if name in _UNIQUE_KEY else None
+        for k in range(scale):
+            for row in body:
+                row = list(row)
+                if key is not None and k and row[key]:
+                    row[key] = f"{row[key]} #{k}"
+                ws.append(row)
+    out = BytesIO()
+    wb.save(out)
+    return out.getvalue()
@@ -0,0 +1 @@
+"""Streamlit-free core of the Cosmic Generator app."""
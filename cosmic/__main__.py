@@ -0,0 +1,226 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from . import sheet_cache
+from .astro import ZODIAC, moon_signs
+from .audit import audit_frame
+from .compat import compat_index
+from .workbook import open_snapshot, read_default_workbook, workbook_key
+
+
+def _snapshot(path):
+    if path:
+        with open(path, "rb") as f:
+            return open_snapshot(f.read())
+    return open_snapshot(read_default_workbook())
+
+
+def cmd_prewarm(args):
+    if args.cache_dir:
+        os.environ["COSMIC_CACHE_DIR"] = args.cache_dir
+    paths = args.workbook or [None]
+    for path in paths:
+        if path:
+            with open(path, "rb") as f:
+                raw = f.read()
+        else:
+            raw = read_default_workbook()
+        key = workbook_key(raw)
+        hit = sheet_cache.read_sheets(key) is not None
+        open_snapshot(raw, key)
+        state = "cached" if hit else ("written" if sheet_cache.read_sheets(key) is not None else "not cacheable")
+        print(f"{path or 'default workbook'}: {key[:12]} {state} in {sheet_cache.cache_dir()}")
+    return 0
+
+
+def cmd_audit(args):
+    snapshot = _snapshot(args.workbook)
+    source = sys.stdin if args.input == "-" else args.input
+    out = sys.stdout if args.output == "-" else args.output
+    first = True
+    # chunks keep a running index, so "row" numbers stay global across chunks
+    for chunk in pd.read_csv(source, chunksize=args.chunksize, dtype=str, keep_default_na=False):
+        if args.id_col:
+            chunk = chunk.set_index(args.id_col)
+        df_res, df_sum = audit_frame(snapshot, chunk, args.sign_col, args.category_col, args.text_col)
+        mode = "w" if first else "a"
+        df_res.to_csv(out, mode=mode, header=first, index=False)
+        if args.summary:
+            df_sum.to_csv(args.summary, mode=mode, header=first, index=False)
+        first = False
+    return 0
+
+
+def cmd_group(args):
+    snapshot = _snapshot(args.workbook)
+    source = sys.stdin if args.input == "-" else args.input
+    people = pd.read_csv(source, dtype=str, keep_default_na=False)
+    names = people[args.name_col] if args.name_col in people else None
+    pairs, summary = compat_index(snapshot).group(people[args.sign_col], names,
+                                                  min_level=2 if args.strong_only else 1)
+    pairs.to_csv(sys.stdout if args.output == "-" else args.output, index=False)
+    if args.summary:
+        summary.to_csv(args.summary, index=False)
+    return 0
+
+
+_SIGN_NAMES = np.array(ZODIAC + [""])  # index -1: date/time didn't parse
+
+
+def _report_unparsed(bad, date_col):
+    if bad:
+        print(f"{bad} row(s) with an unparseable {date_col}/time left blank", file=sys.stderr)
+
+
+def cmd_moon(args):
+    source = sys.stdin if args.input == "-" else args.input
+    out = sys.stdout if args.output == "-" else args.output
+    first, bad = True, 0
+    for chunk in pd.read_csv(source, chunksize=args.chunksize, dtype=str, keep_default_na=False):
+        times = chunk[args.time_col].replace("", "12:00") if args.time_col in chunk else None
+        tz = pd.to_numeric(chunk[args.tz_col], errors="coerce").fillna(0.0) if args.tz_col in chunk else 0.0
+        idx, lon, exact = moon_signs(chunk[args.date_col], times, tz, exact=False if args.approx else None, processes=args.processes)
+        bad += int((idx < 0).sum())
+        chunk = chunk.assign(moon_sign=_SIGN_NAMES[idx], moon_lon=lon.round(4), moon_exact=exact)
+        chunk.to_csv(out, mode="w" if first else "a", header=first, index=False)
+        first = False
+    _report_unparsed(bad, args.date_col)
+    return 0
+
+
+def _bodies(value):
+    from .chart import BODIES
+    bodies = [b.strip().capitalize() for b in value.split(",") if b.strip()]
+    unknown = [b for b in bodies if b not in BODIES]
+    if unknown or not bodies:
+        raise argparse.ArgumentTypeError(
+            f"unknown bodies {', '.join(unknown) or value!r}; choose from {', '.join(BODIES).lower()}")
+    return bodies
+
+
+def cmd_chart(args):
+    from .chart import BODIES, charts
+    source = sys.stdin if args.input == "-" else args.input
+    out = sys.stdout if args.output == "-" else args.output
+    bodies = args.bodies or list(BODIES)
+    first, bad = True, 0
+    for chunk in pd.read_csv(source, chunksize=args.chunksize, dtype=str, keep_default_na=False):
+        times = chunk[args.time_col].replace("", "12:00") if args.time_col in chunk else None
+        tz = pd.to_numeric(chunk[args.tz_col], errors="coerce").fillna(0.0) if args.tz_col in chunk else 0.0
+        placed = charts(chunk[args.date_col], times, tz, bodies, exact=False if args.approx else None,
+                        processes=args.processes)
+        columns = {}
+        for body, (idx, lon, exact) in placed.items():
+            name = body.lower()
+            columns.update({f"{name}_sign": _SIGN_NAMES[idx], f"{name}_lon": lon.round(4), f"{name}_exact": exact})
+        bad += int((idx < 0).sum())
+        chunk = chunk.assign(**columns)
+        chunk.to_csv(out, mode="w" if first else "a", header=first, index=False)
+        first = False
+    _report_unparsed(bad, args.date_col)
+    return 0
+
+
+def cmd_build_ephemeris(args):
+    from .ephemeris import PLANET_TABLE_PATH, TABLE_PATH, write_ingress_table, write_planet_tables
+    path = args.output or TABLE_PATH
+    table = write_ingress_table(path, start_year=args.start, end_year=args.end)
+    print(f"{len(table)} Moon ingresses {args.start}-{args.end} written to {path}")
+    path = args.planets_output or PLANET_TABLE_PATH
+    arrays = write_planet_tables(path, start_year=args.start, end_year=args.end)
+    count = sum(len(v) - 2 for k, v in arrays.items() if k.endswith("_jd"))
+    print(f"{count} Sun/planet ingresses {args.start}-{args.end} written to {path}")
+    return 0
+
+
+def cmd_serve(args):
+    try:
+        import uvicorn
+    except ImportError:
+        print("python -m cosmic serve needs uvicorn (pip install uvicorn)", file=sys.stderr)
+        return 1
+    if args.workbook:
+        os.environ["COSMIC_WORKBOOK"] = os.path.abspath(args.workbook)
+    uvicorn.run("cosmic.service:create_app", factory=True, host=args.host, port=args.port,
+                workers=args.workers, log_level="warning")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cosmic")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("prewarm", help="parse workbooks into the on-disk sheet cache")
+    p.add_argument("workbook", nargs="*", help="xlsx files (default: bundled workbook)")
+    p.add_argument("--cache-dir", help="override COSMIC_CACHE_DIR")
+    p.set_defaults(func=cmd_prewarm)
+
+    p = sub.add_parser("audit", help="Life Audit a CSV of (sign, category, text) rows")
+    p.add_argument("input", help="input CSV ('-' for stdin)")
+    p.add_argument("-o", "--output", default="-", help="token results CSV (default stdout)")
+    p.add_argument("--summary", help="per-row category summary CSV")
+    p.add_argument("--workbook", help="xlsx with the AuditData/Data sheets (default: bundled workbook)")
+    p.add_argument("--sign-col", default="sign")
+    p.add_argument("--category-col", default="category")
+    p.add_argument("--text-col", default="text")
+    p.add_argument("--id-col", help="column reported as 'row' instead of the line number")
+    p.add_argument("--chunksize", type=int, default=50_000)
+    p.set_defaults(func=cmd_audit)
+
+    p = sub.add_parser("group", help="pairwise sign/element conflicts for a CSV of people")
+    p.add_argument("input", help="input CSV ('-' for stdin)")
+    p.add_argument("-o", "--output", default="-", help="conflicting pairs CSV (default stdout)")
+    p.add_argument("--summary", help="per-person STRONG/MILD counts CSV")
+    p.add_argument("--workbook", help="xlsx with the AuditData/Data sheets (default: bundled workbook)")
+    p.add_argument("--sign-col", default="sign")
+    p.add_argument("--name-col", default="name", help="person label; the line number if the column is missing")
+    p.add_argument("--strong-only", action="store_true", help="only list STRONG conflicts")
+    p.set_defaults(func=cmd_group)
+
+    p = sub.add_parser("moon", help="add Moon sign columns to a CSV of birth records")
+    p.add_argument("input", help="input CSV ('-' for stdin)")
+    p.add_argument("-o", "--output", default="-", help="output CSV (default stdout)")
+    p.add_argument("--date-col", default="date")
+    p.add_argument("--time-col", default="time", help="local clock time; noon if the column is missing")
+    p.add_argument("--tz-col", default="tz", help="UTC offset in hours; 0 if the column is missing")
+    p.add_argument("--approx", action="store_true", help="skip Swiss Ephemeris")
+    p.add_argument("--processes", type=int, help="Swiss Ephemeris worker processes")
+    p.add_argument("--chunksize", type=int, default=100_000)
+    p.set_defaults(func=cmd_moon)
+
+    p = sub.add_parser("chart", help="add Sun, Moon and planet sign columns to a CSV of birth records")
+    p.add_argument("input", help="input CSV ('-' for stdin)")
+    p.add_argument("-o", "--output", default="-", help="output CSV (default stdout)")
+    p.add_argument("--bodies", type=_bodies, help="comma-separated subset, e.g. sun,moon,venus (default: all)")
+    p.add_argument("--date-col", default="date")
+    p.add_argument("--time-col", default="time", help="local clock time; noon if the column is missing")
+    p.add_argument("--tz-col", default="tz", help="UTC offset in hours; 0 if the column is missing")
+    p.add_argument("--approx", action="store_true", help="skip the ingress tables and Swiss Ephemeris")
+    p.add_argument("--processes", type=int, help="Swiss Ephemeris worker processes (outside the tables' range)")
+    p.add_argument("--chunksize", type=int, default=100_000)
+    p.set_defaults(func=cmd_chart)
+
+    p = sub.add_parser("build-ephemeris", help="regenerate the ingress tables (needs pyswisseph)")
+    p.add_argument("--start", type=int, default=1900)
+    p.add_argument("--end", type=int, default=2100)
+    p.add_argument("-o", "--output", help="Moon table .npy (default: the bundled table)")
+    p.add_argument("--planets-output", help="Sun/planet table .npz (default: the bundled table)")
+    p.set_defaults(func=cmd_build_ephemeris)
+
+    p = sub.add_parser("serve", help="serve profile reports over HTTP (JSON)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--workbook", help="xlsx to serve (default: bundled workbook)")
+    p.set_defaults(func=cmd_serve)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Sun/Moon sign calculations and numerology helpers."""
+import datetime as dt
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .ephemeris import ingress_signs
+from .metrics import timed
+
+# --- Optional Swiss Ephemeris ---
+try:
+    import swisseph as swe
+    HAVE_SWE = True
+except Exception:
+    HAVE_SWE = False
+
+ZODIAC = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"]
+
+
+def _rev(x): return x % 360.0
+
+
+def moon_longitude_approx_noon_utc(d: dt.date):
+    year, month, day = d.year, d.month, d.day
+    hour = 12.0
+    if month <= 2:
+        year -= 1
+        month += 12
+    A = int(year/100)
+    B = 2 - A + int(A/4)
+    JD = int(365.25*(year + 4716)) + int(30.6001*(month + 1)) + (day + hour/24.0) + B - 1524.5
+    T = (JD - 2451545.0)/36525.0
+    Lp = _rev(218.3164477 + 481267.88123421*T - 0.0015786*T*T)
+    D  = _rev(297.8501921 + 445267.1114034*T - 0.0018819*T*T)
+    M  = _rev(357.5291092 + 35999.0502909*T - 0.0001536*T*T)
+    Mp = _rev(134.9633964 + 477198.8675055*T + 0.0087414*T*T)
+    F  = _rev(93.2720950 + 483202.0175233*T - 0.0036539*T*T)
+    Dr = math.radians(D); Mr = math.radians(M); Mpr = math.radians(Mp); Fr = math.radians(F)
+    lon = (Lp
+        + 6.289 * math.sin(Mpr)
+        + 1.274 * math.sin(2*Dr - Mpr)
+        + 0.658 * math.sin(2*Dr)
+        + 0.214 * math.sin(2*Mpr)
+        - 0.186 * math.sin(Mr)
+        - 0.114 * math.sin(2*Fr)
+        + 0.059 * math.sin(2*Dr - 2*Mpr)
+        + 0.057 * math.sin(2*Dr - Mr - Mpr)
+        + 0.053 * math.sin(2*Dr + Mpr)
+        + 0.046 * math.sin(2*Dr - Mr)
+        + 0.041 * math.sin(Mr + Mpr))
+    return _rev(lon)
+
+
+def julian_day(d: dt.date, t: dt.time = dt.time(12, 0), tz_offset: float = 0.0):
+    hour_utc = t.hour + t.minute/60 + t.second/3600 - float(tz_offset)
+    return d.toordinal() + 1721424.5 + hour_utc/24.0
+
+
+@timed("astro.moon_sign_exact")
+def moon_sign_exact(birthdate: dt.date, birthtime: dt.time, tz_offset: float):
+    try:
+        jd = julian_day(birthdate, birthtime, tz_offset)
+        idx, lon, inside = moon_from_table(jd)
+        if inside:
+            # the table gives the sign; the longitude is only exact from Swiss Ephemeris
+            if HAVE_SWE:
+                lon = clamp_to_sign(idx, swe.calc_ut(jd, swe.MOON)[0][0])
+                return ZODIAC[int(idx)], float(lon), True
+            return ZODIAC[int(idx)], float(lon), False
+        if HAVE_SWE:
+            pos = swe.calc_ut(jd, swe.MOON)[0]
+            lon = float(pos[0])
+            idx = int(lon // 30) % 12
+            return ZODIAC[idx], lon, True
+        lon = moon_longitude_approx_noon_utc(birthdate)
+        idx = int(lon // 30) % 12
+        return ZODIAC[idx], lon, False
+    except Exception:
+        lon = moon_longitude_approx_noon_utc(birthdate)
+        idx = int(lon // 30) % 12
+        return ZODIAC[idx], lon, False
+
+
+def universal_day_number(d: dt.date, keep_master=True):
+    s = d.strftime("%Y%m%d")
+    n = sum(int(ch) for ch in s)
+    if keep_master and n in (11, 22, 33):
+        return n
+    return 9 if n % 9 == 0 else n % 9
+
+
+def weekday_name(d: dt.date):
+    return d.strftime("%A")
+
+
+# --- Vectorized ---
+# Bulk variants of the helpers above for imports of many birth records; they
+# take array-likes and return NumPy arrays (sign indices into ZODIAC).
+
+def _hours(times):
+    """Clock times (datetime.time, "HH:MM[:SS]" strings or numeric hours) as float hours; NaN if unparseable."""
+    arr = np.asarray(times)
+    if arr.dtype.kind in "iuf":
+        return arr.astype(float)
+    if arr.dtype.kind == "m":
+        return arr.astype("timedelta64[s]").astype(float) / 3600.0
+    text = pd.Series(arr.ravel()).astype(str).str.strip()
+    text = text.where(text.str.count(":") != 1, text + ":00")
+    return (pd.to_timedelta(text, errors="coerce").dt.total_seconds().to_numpy() / 3600.0).reshape(arr.shape)
+
+
+def julian_days(dates, times=None, tz_offsets=0.0):
+    """UT Julian days for local dates/times; noon UTC when times is None.
+
+    Dates or times that don't parse (e.g. 1990-02-30) give NaN.
+    """
+    days = pd.to_datetime(np.asarray(dates), errors="coerce").values.astype("datetime64[D]")
+    jd = np.where(np.isnat(days), np.nan, days.astype("int64") + 2440587.5)
+    if times is None:
+        return jd + 0.5
+    return jd + (_hours(times) - np.asarray(tz_offsets, dtype=float)) / 24.0
+
+
+def moon_longitude_approx(jd):
+    """Vectorized form of the series in moon_longitude_approx_noon_utc."""
+    T = (np.asarray(jd, dtype=float) - 2451545.0)/36525.0
+    Lp = _rev(218.3164477 + 481267.88123421*T - 0.0015786*T*T)
+    Dr = np.radians(_rev(297.8501921 + 445267.1114034*T - 0.0018819*T*T))
+    Mr = np.radians(_rev(357.5291092 + 35999.0502909*T - 0.0001536*T*T))
+    Mpr = np.radians(_rev(134.9633964 + 477198.8675055*T + 0.0087414*T*T))
+    Fr = np.radians(_rev(93.2720950 + 483202.0175233*T - 0.0036539*T*T))
+    lon = (Lp
+        + 6.289 * np.sin(Mpr)
+        + 1.274 * np.sin(2*Dr - Mpr)
+        + 0.658 * np.sin(2*Dr)
+        + 0.214 * np.sin(2*Mpr)
+        - 0.186 * np.sin(Mr)
+        - 0.114 * np.sin(2*Fr)
+        + 0.059 * np.sin(2*Dr - 2*Mpr)
+        + 0.057 * np.sin(2*Dr - Mr - Mpr)
+        + 0.053 * np.sin(2*Dr + Mpr)
+        + 0.046 * np.sin(2*Dr - Mr)
+        + 0.041 * np.sin(Mr + Mpr))
+    return _rev(lon)
+
+
+def moon_from_table(jd):
+    """Moon sign from the ingress table: (sign index, longitude, in-range mask).
+
+    The sign comes from the exact ingress instants; the longitude is the
+    approximate series clamped into that sign (within ~0.25° of Swiss
+    Ephemeris).
+    """
+    idx, inside = ingress_signs(jd)
+    return idx, clamp_to_sign(idx, moon_longitude_approx(jd)), inside
+
+
+def clamp_to_sign(idx, lon):
+    """Longitudes moved to the nearest point inside sign idx (for table signs)."""
+    lo = 30.0 * idx
+    return lo + np.clip((lon - lo + 180.0) % 360.0 - 180.0, 0.0, 30.0 - 1e-9)
+
+
+def _swe_moon_longitude(jd):
+    if not math.isfinite(jd):
+        return math.nan
+    try:
+        return swe.calc_ut(jd, swe.MOON)[0][0]
+    except swe.Error:
+        return math.nan
+
+
+def _swe_moon_longitudes(jds):
+    return np.array([_swe_moon_longitude(float(jd)) for jd in jds], dtype=float)
+
+
+def swe_moon_longitudes(jds, processes=None, min_chunk=20_000):
+    """Swiss Ephemeris Moon longitudes, computed once per distinct Julian day.
+
+    NaN where the instant is not finite or outside the ephemeris files' range.
+
+    With processes > 1 and enough distinct instants, the work is split
+    across a process pool.
+    """
+    uniq, inverse = np.unique(np.asarray(jds, dtype=float), return_inverse=True)
+    if processes and processes > 1 and len(uniq) >= 2 * min_chunk:
+        chunks = np.array_split(uniq, min(processes, len(uniq) // min_chunk))
+        with ProcessPoolExecutor(processes) as pool:
+            lon = np.concatenate(list(pool.map(_swe_moon_longitudes, chunks)))
+    else:
+        lon = _swe_moon_longitudes(uniq)
+    return lon[inverse.reshape(-1)].reshape(np.shape(jds))
+
+
+def moon_signs(dates, times=None, tz_offsets=0.0, exact=None, processes=None):
+    """Bulk moon_sign_exact: returns (sign index array, longitude array, exact).
+
+    exact=None reads signs from the ingress table and falls back to Swiss
+    Ephemeris (if installed) or the approximate series outside its range;
+    exact=True always uses Swiss Ephemeris, exact=False the series. The
+    series is evaluated at the actual UT instant when times are given (at
+    noon UTC otherwise, like the scalar fallback). Rows whose date or time
+    doesn't parse get sign index -1 and a NaN longitude. ``exact`` in the result
+    is False if any longitude came from the series; within the table's
+    range that includes exact signs whose longitude is the clamped series.
+    """
+    jd = np.atleast_1d(julian_days(dates, times, tz_offsets))
+    if exact is None:
+        idx, lon, inside = moon_from_table(jd)
+        if inside.all():
+            return idx, lon, False
+        out = ~inside
+        sub_idx, sub_lon, _ = moon_signs_jd(jd[out], HAVE_SWE, processes)
+        idx[out], lon[out] = sub_idx, sub_lon
+        return idx, lon, False
+    return moon_signs_jd(jd, exact, processes)
+
+
+def moon_signs_jd(jd, exact, processes=None):
+    if exact and HAVE_SWE:
+        lon = swe_moon_longitudes(jd, processes)
+        missing = np.isnan(lon)
+        if missing.any():
+            exact = False
+            lon[missing] = moon_longitude_approx(jd[missing])
+    else:
+        exact = False
+        lon = moon_longitude_approx(jd)
+    idx = np.where(np.isfinite(lon), np.nan_to_num(lon) // 30 % 12, -1).astype(np.int8)
+    return idx, lon, exact
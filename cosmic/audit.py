@@ -0,0 +1,314 @@
+"""Life Audit rules: tokenizing user lists and matching them against AuditData."""
+import re
+from bisect import bisect_right
+
+import pandas as pd
+
+# (label, strong column, mild column, remedy column 1, remedy column 2, mode)
+AUDIT_CATEGORIES = [
+    ("Colours / Décor", "Avoid Household (strong)", "Avoid Household (mild)", "Colour", "Household Items", "general"),
+    ("Foods", "Avoid Foods (strong)", "Avoid Foods (mild)", "Foods", "Foods", "general"),
+    ("Crystals & Gemstones", "Avoid Crystals (strong)", "Avoid Crystals (mild)", "Primary Crystals", "Alternative Crystals / Gemstones", "general"),
+    ("Activities", "Avoid Activities (strong)", "Avoid Activities (mild)", "Favorable Activities", "Favorable Activities", "names_only"),
+    ("Elements", "Avoid Elements (strong)", "Avoid Elements (mild)", "Element", "Element", "general"),
+    ("People (Signs)", "Enemy Signs (strong)", "Enemy Signs (mild)", None, None, "names_only"),
+]
+
+
+def tokenize(user_text, mode="general"):
+    if not user_text: return []
+    # split only on commas/newlines; keep phrases
+    parts = re.split(r"[,\n]", user_text)
+    tokens = []
+    for p in parts:
+        t = re.sub(r"\s+", " ", p.strip().lower())
+        if t:
+            tokens.append(t)
+    return tokens
+
+
+def normalize_list(csv_str):
+    if not csv_str: return []
+    terms = [re.sub(r"\s+", " ", x.strip().lower()) for x in str(csv_str).split(",")]
+    return [t for t in terms if t]
+
+
+def match_token(tok, strong_terms, mild_terms):
+    """Reference matcher; TermMatcher.match returns the same verdicts."""
+    # exact first
+    if tok in strong_terms: return "STRONG", tok
+    if tok in mild_terms:   return "MILD", tok
+    # word-boundary contains: token in term or term in token
+    for term in strong_terms:
+        if re.search(rf"\b{re.escape(tok)}\b", term) or re.search(rf"\b{re.escape(term)}\b", tok):
+            return "STRONG", term
+    for term in mild_terms:
+        if re.search(rf"\b{re.escape(tok)}\b", term) or re.search(rf"\b{re.escape(term)}\b", tok):
+            return "MILD", term
+    # fallback substring (less strict)
+    for term in strong_terms:
+        if tok in term or term in tok:
+            return "STRONG", term
+    for term in mild_terms:
+        if tok in term or term in tok:
+            return "MILD", term
+    return "OK", ""
+
+
+_BOUNDARY = re.compile(r"\b")
+
+
+def _is_word(ch):
+    # same notion of a word character as re's \w on str patterns
+    return ch.isalnum() or ch == "_"
+
+
+def _boundary_at(text, pos):
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < len(text) and _is_word(text[pos])
+    return before != after
+
+
+class _TermIndex:
+    """One term list compiled for match_token's word-boundary and substring passes.
+
+    Lookups return the index of the first term (in list order) that
+    matches, so results agree with the reference loops.
+    """
+    __slots__ = ("terms", "exact", "_first", "_lengths", "_max_len", "_joined", "_starts")
+
+    def __init__(self, terms):
+        self.terms = tuple(terms)
+        self.exact = frozenset(self.terms)
+        self._first = {}
+        for i, t in enumerate(self.terms):
+            self._first.setdefault(t, i)
+        self._lengths = sorted({len(t) for t in self.terms})
+        self._max_len = self._lengths[-1] if self._lengths else 0
+        # Terms joined by "\n" (which tokens never contain): a search for the
+        # token finds the first term containing it in one call.
+        self._joined = "\n".join(self.terms)
+        self._starts, pos = [], 0
+        for t in self.terms:
+            self._starts.append(pos)
+            pos += len(t) + 1
+
+    def _term_at(self, pos):
+        return bisect_right(self._starts, pos) - 1
+
+    def _tok_in_term(self, tok, word):
+        pos = self._joined.find(tok)
+        while pos >= 0:
+            if not word or (_boundary_at(self._joined, pos) and _boundary_at(self._joined, pos + len(tok))):
+                return self._term_at(pos)
+            pos = self._joined.find(tok, pos + 1)
+        return len(self.terms)
+
+    def word(self, tok, bounds):
+        """First term with tok in it, or in tok, on word boundaries (-1 if none)."""
+        if not self.terms: return -1
+        best = self._tok_in_term(tok, True)
+        # term in tok: only spans between two boundary positions of tok can match
+        for a, i in enumerate(bounds):
+            for j in bounds[a + 1:]:
+                if j - i > self._max_len:
+                    break
+                k = self._first.get(tok[i:j])
+                if k is not None and k < best:
+                    best = k
+        return best if best < len(self.terms) else -1
+
+    def substring(self, tok):
+        """First term with tok in it, or in tok (-1 if none)."""
+        if not self.terms: return -1
+        best = self._tok_in_term(tok, False)
+        for n in self._lengths:
+            for i in range(len(tok) - n + 1):
+                k = self._first.get(tok[i:i + n])
+                if k is not None and k < best:
+                    best = k
+        return best if best < len(self.terms) else -1
+
+
+class TermMatcher:
+    """Strong/mild avoid lists for one sign and category, compiled once."""
+    __slots__ = ("strong", "mild")
+
+    def __init__(self, strong_terms, mild_terms):
+        self.strong = _TermIndex(strong_terms)
+        self.mild = _TermIndex(mild_terms)
+
+    def match(self, tok):
+        if tok in self.strong.exact: return "STRONG", tok
+        if tok in self.mild.exact:   return "MILD", tok
+        bounds = [m.start() for m in _BOUNDARY.finditer(tok)]
+        i = self.strong.word(tok, bounds)
+        if i >= 0: return "STRONG", self.strong.terms[i]
+        i = self.mild.word(tok, bounds)
+        if i >= 0: return "MILD", self.mild.terms[i]
+        i = self.strong.substring(tok)
+        if i >= 0: return "STRONG", self.strong.terms[i]
+        i = self.mild.substring(tok)
+        if i >= 0: return "MILD", self.mild.terms[i]
+        return "OK", ""
+
+
+def _cell(row, col):
+    v = row.get(col, "")
+    return "" if v is None or pd.isna(v) else v
+
+
+def build_matchers(df_audit):
+    """{sign: {category label: TermMatcher}} for every AuditData row."""
+    if df_audit.empty or "Astrological Sign" not in df_audit.columns:
+        return {}
+    matchers = {}
+    for _, row in df_audit.iterrows():
+        sign = row["Astrological Sign"]
+        if not isinstance(sign, str) or sign in matchers:
+            continue
+        matchers[sign] = {
+            label: TermMatcher(normalize_list(_cell(row, col_strong)), normalize_list(_cell(row, col_mild)))
+            for (label, col_strong, col_mild, _, _, _) in AUDIT_CATEGORIES
+        }
+    return matchers
+
+
+def audit_matchers(snapshot):
+    return snapshot.derive(_audit_matchers)
+
+
+def _audit_matchers(snapshot):
+    return build_matchers(snapshot.sheet("AuditData"))
+
+
+def sign_data_rows(snapshot):
+    """{sign: Data sheet row} used for remedy text."""
+    return snapshot.derive(_sign_data_rows)
+
+
+def _sign_data_rows(snapshot):
+    df_data = snapshot.sheet("Data")
+    if df_data.empty or "Astrological Sign" not in df_data.columns:
+        return {}
+    rows = {}
+    for _, row in df_data.iterrows():
+        rows.setdefault(row["Astrological Sign"], row)
+    return rows
+
+
+def audit_tokens(matcher, tokens, memo=None):
+    """[(token, verdict, matched term)], strong hits, mild hits."""
+    rows = []
+    strong_hits = mild_hits = 0
+    for tok in tokens:
+        if memo is None:
+            verdict, src = matcher.match(tok)
+        else:
+            try:
+                verdict, src = memo[tok]
+            except KeyError:
+                verdict, src = memo[tok] = matcher.match(tok)
+        if verdict=="STRONG": strong_hits += 1
+        elif verdict=="MILD": mild_hits += 1
+        rows.append((tok, verdict, src))
+    return rows, strong_hits, mild_hits
+
+
+def category_fixes(label, strong_hits, mild_hits, drow):
+    """Top remedies for one category; drow is the sign's Data row (or None)."""
+    fixes = []
+    if drow is None:
+        return fixes
+    if strong_hits>0:
+        if label=="Colours / Décor" and "Colour" in drow:
+            fixes.append(f"Switch to favourable colours: {drow['Colour']}")
+        if label=="Foods" and "Foods" in drow:
+            fixes.append(f"Prioritize: {drow['Foods']}")
+        if label=="Crystals & Gemstones":
+            if "Primary Crystals" in drow: fixes.append(f"Carry/wear: {drow['Primary Crystals']}")
+            if "Alternative Crystals / Gemstones" in drow: fixes.append(f"Alternate set: {drow['Alternative Crystals / Gemstones']}")
+        if label=="Activities" and "Favorable Activities" in drow:
+            fixes.append(f"Swap to: {drow['Favorable Activities']}")
+        if label=="Elements" and "Element" in drow:
+            fixes.append(f"Emphasize {drow['Element']} items")
+        if label=="People (Signs)":
+            fixes.append("Reduce strong enemy-sign dynamics; choose neutral/shared-element activities")
+    elif mild_hits>0:
+        if label in ("Colours / Décor","Elements","Crystals & Gemstones"):
+            fixes.append("Balance with supportive colours/crystals of your element")
+        if label=="Foods":
+            fixes.append("Moderate intake; avoid combos with other flagged foods")
+        if label=="Activities":
+            fixes.append("Do on a favourable weekday/number to offset mild conflicts")
+        if label=="People (Signs)":
+            fixes.append("Choose neutral settings; keep interactions short")
+    return fixes[:3]
+
+
+def audit_rows(matcher, label, user_text):
+    """[(label, token, verdict, matched term)], strong hits, mild hits.
+
+    An empty list yields a single blank OK row.
+    """
+    tokens = tokenize(user_text)
+    if not tokens:
+        return [(label, "", "OK", "")], 0, 0
+    token_rows, strong_hits, mild_hits = audit_tokens(matcher, tokens)
+    return [(label, tok, verdict, src) for tok, verdict, src in token_rows], strong_hits, mild_hits
+
+
+def audit_category(matcher, label, user_text, drow=None):
+    """Life Audit one category for one sign, as in the app.
+
+    Returns ([(label, token, verdict, matched term)], (label, strong, mild, fixes)).
+    """
+    results, strong_hits, mild_hits = audit_rows(matcher, label, user_text)
+    fixes = category_fixes(label, strong_hits, mild_hits, drow)
+    return results, (label, strong_hits, mild_hits, ", ".join(fixes))
+
+
+RESULT_COLUMNS = ["row", "sign", "category", "token", "conflict", "matched_term"]
+SUMMARY_COLUMNS = ["row", "sign", "category", "rules", "strong", "mild", "fixes"]
+
+
+def audit_frame(snapshot, df, sign_col="sign", category_col="category", text_col="text"):
+    """Audit many (sign, category, user text) rows at once.
+
+    Rows are grouped by sign so each sign's matchers and remedy row are
+    looked up once, and verdicts are memoized per (sign, category) since
+    exports repeat the same tokens heavily. Signs match the workbook's
+    case-insensitively, ignoring surrounding whitespace. Returns (token results, one
+    summary row per input row); ``row`` is the input index label.
+    """
+    matchers = audit_matchers(snapshot)
+    data_rows = sign_data_rows(snapshot)
+    names = {}
+    for known in (*matchers, *data_rows):
+        if isinstance(known, str):
+            names.setdefault(known.strip().lower(), known)
+    results, summary = [], []
+    for sign, positions in df.groupby(sign_col, sort=False, dropna=False).indices.items():
+        group = df.iloc[positions]
+        key = sign
+        if sign not in matchers and sign not in data_rows and isinstance(sign, str):
+            key = names.get(sign.strip().lower(), sign)
+        sign_matchers = matchers.get(key, {})
+        drow = data_rows.get(key)
+        memos = {}
+        for pos, row, label, text in zip(positions, group.index, group[category_col], group[text_col]):
+            matcher = sign_matchers.get(label)
+            if matcher is None:
+                summary.append((pos, row, sign, label, False, 0, 0, ""))
+                continue
+            tokens = tokenize(text if isinstance(text, str) else "")
+            token_rows, strong_hits, mild_hits = audit_tokens(matcher, tokens, memos.setdefault(label, {}))
+            results.extend((pos, row, sign, label, tok, verdict, src) for tok, verdict, src in token_rows)
+            fixes = category_fixes(label, strong_hits, mild_hits, drow)
+            summary.append((pos, row, sign, label, True, strong_hits, mild_hits, ", ".join(fixes)))
+    return _in_input_order(results, RESULT_COLUMNS), _in_input_order(summary, SUMMARY_COLUMNS)
+
+
+def _in_input_order(rows, columns):
+    df = pd.DataFrame(rows, columns=["_pos"] + columns)
+    return df.sort_values("_pos", kind="stable").drop(columns="_pos").reset_index(drop=True)
@@ -0,0 +1,215 @@
+"""Natal charts: Sun, Moon and the classical planets from one Julian day.
+
+Signs come from the ingress tables where they cover the date (exact, and a
+binary search per body), then Swiss Ephemeris when it is installed
+(memoized per rounded instant and body), otherwise from vectorized
+approximations: the Moon series in astro and JPL Keplerian elements
+(Standish, valid 1800-2050, within ~0.4°) for the Sun and planets.
+
+``exact`` is about the longitude: a table sign with an approximate
+longitude is reported as not exact. chart() takes the longitude from
+Swiss Ephemeris when it is installed; the bulk path keeps the approximation
+so the tables still save the Swiss Ephemeris calls.
+"""
+import datetime as dt
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .astro import HAVE_SWE, ZODIAC, clamp_to_sign, julian_day, julian_days, moon_from_table, moon_longitude_approx
+from .ephemeris import planet_signs
+from .metrics import timed
+
+if HAVE_SWE:
+    import swisseph as swe
+
+BODIES = ("Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn")
+# JD rounding for the memo: 1e-6 day is under 0.1 s
+JD_DECIMALS = 6
+# general precession in longitude, degrees per Julian century (J2000 ecliptic -> of date)
+PRECESSION = 1.3969713
+
+# a (AU), e, I, L, longitude of perihelion, longitude of node (degrees), each
+# with its rate per Julian century from J2000; "Earth" is the Earth-Moon barycentre.
+_KEPLER = {
+    "Mercury": ((0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+                (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081)),
+    "Venus":   ((0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+                (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418)),
+    "Earth":   ((1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+                (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0)),
+    "Mars":    ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+                (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+    "Jupiter": ((5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909),
+                (-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106)),
+    "Saturn":  ((9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+                (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.54179478, -0.28867794)),
+}
+
+
+@dataclass(frozen=True)
+class Placement:
+    body: str
+    sign: str
+    longitude: float
+    exact: bool
+
+
+def _heliocentric_xy(name, T):
+    """Ecliptic (J2000) x, y in AU from the Keplerian elements at centuries T."""
+    base, rate = _KEPLER[name]
+    a, e, inc, L, peri, node = (b + r * T for b, r in zip(base, rate))
+    M = np.radians((L - peri + 180.0) % 360.0 - 180.0)
+    E = M + e * np.sin(M)
+    for _ in range(5):
+        E = E - (E - e * np.sin(E) - M) / (1.0 - e * np.cos(E))
+    xp = a * (np.cos(E) - e)
+    yp = a * np.sqrt(1.0 - e * e) * np.sin(E)
+    w, O, i = np.radians(peri - node), np.radians(node), np.radians(inc)
+    x = (np.cos(w) * np.cos(O) - np.sin(w) * np.sin(O) * np.cos(i)) * xp \
+        + (-np.sin(w) * np.cos(O) - np.cos(w) * np.sin(O) * np.cos(i)) * yp
+    y = (np.cos(w) * np.sin(O) + np.sin(w) * np.cos(O) * np.cos(i)) * xp \
+        + (-np.sin(w) * np.sin(O) + np.cos(w) * np.cos(O) * np.cos(i)) * yp
+    return x, y
+
+
+def approx_longitudes(jd, body):
+    """Approximate tropical geocentric longitude of body at UT Julian days."""
+    jd = np.asarray(jd, dtype=float)
+    if body == "Moon":
+        return moon_longitude_approx(jd)
+    T = (jd - 2451545.0) / 36525.0
+    xe, ye = _heliocentric_xy("Earth", T)
+    if body == "Sun":
+        x, y = -xe, -ye
+    else:
+        xp, yp = _heliocentric_xy(body, T)
+        x, y = xp - xe, yp - ye
+    return (np.degrees(np.arctan2(y, x)) + PRECESSION * T) % 360.0
+
+
+def from_table(body, jd):
+    """(sign index, longitude, in-range mask) from the ingress tables.
+
+    As with astro.moon_from_table, the sign is exact but the longitude is
+    only the approximation clamped into it.
+    """
+    if body == "Moon":
+        return moon_from_table(jd)
+    idx, inside = planet_signs(body, jd)
+    return idx, clamp_to_sign(idx, approx_longitudes(jd, body)), inside
+
+
+if HAVE_SWE:
+    _SWE_BODY = {"Sun": swe.SUN, "Moon": swe.MOON, "Mercury": swe.MERCURY, "Venus": swe.VENUS,
+                 "Mars": swe.MARS, "Jupiter": swe.JUPITER, "Saturn": swe.SATURN}
+
+    def _swe_calc(jd, body):
+        """Longitude, or NaN where Swiss Ephemeris has no answer (callers fall back)."""
+        if not math.isfinite(jd):
+            return math.nan
+        try:
+            return swe.calc_ut(jd, _SWE_BODY[body])[0][0]
+        except swe.Error:
+            return math.nan
+
+    @lru_cache(maxsize=65536)
+    def _swe_longitude(jd, body):
+        """_swe_calc memoized for chart(); the batch path de-duplicates instants itself."""
+        return _swe_calc(jd, body)
+
+
+def _swe_chunk(args):
+    jds, bodies = args
+    return np.array([[_swe_calc(float(jd), b) for jd in jds] for b in bodies], dtype=float).reshape(len(bodies), -1)
+
+
+def swe_longitudes(jd, bodies=BODIES, processes=None, min_chunk=5_000):
+    """Swiss Ephemeris longitudes, shape (len(bodies),) + jd.shape.
+
+    NaN where the instant is not finite or outside the ephemeris files'
+    range. Each distinct rounded instant is computed once per body; with
+    processes > 1 and enough instants the work is split across a pool.
+    """
+    uniq, inverse = np.unique(np.round(np.asarray(jd, dtype=float), JD_DECIMALS), return_inverse=True)
+    bodies = tuple(bodies)
+    if processes and processes > 1 and len(uniq) >= 2 * min_chunk:
+        chunks = np.array_split(uniq, min(processes, len(uniq) // min_chunk))
+        with ProcessPoolExecutor(processes) as pool:
+            lon = np.concatenate(list(pool.map(_swe_chunk, [(c, bodies) for c in chunks])), axis=1)
+    else:
+        lon = _swe_chunk((uniq, bodies))
+    return lon[:, inverse.reshape(-1)].reshape((len(bodies),) + np.shape(jd))
+
+
+def charts_jd(jd, bodies=BODIES, exact=None, processes=None):
+    """{body: (sign index array, longitude array, exact mask)} for UT Julian days.
+
+    exact=None uses the ingress tables where they cover the date and Swiss
+    Ephemeris (if installed) or the approximations elsewhere; exact=True
+    always uses Swiss Ephemeris, exact=False the approximations. The mask is
+    True where the longitude came from Swiss Ephemeris. Instants
+    Swiss Ephemeris can't place fall back to the approximations; non-finite
+    Julian days get sign index -1 and a NaN longitude.
+    """
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    tables = {body: from_table(body, jd) for body in bodies} if exact is None else {}
+    done = {body for body, (_, _, inside) in tables.items() if inside.all()}
+    swe_bodies = [b for b in bodies if b not in done and exact is not False and HAVE_SWE]
+    # one batched pass over the distinct instants for all remaining bodies
+    swe_lon = dict(zip(swe_bodies, swe_longitudes(jd, swe_bodies, processes))) if swe_bodies else {}
+    out = {}
+    for body in bodies:
+        if body in done:
+            out[body] = tables[body][:2] + (np.zeros(jd.shape, bool),)
+            continue
+        lon, mask = approx_longitudes(jd, body), np.zeros(jd.shape, bool)
+        if body in swe_lon:
+            mask = np.isfinite(swe_lon[body])
+            lon = np.where(mask, swe_lon[body], lon)
+        idx = np.where(np.isfinite(lon), np.nan_to_num(lon) // 30 % 12, -1).astype(np.int8)
+        if body in tables:
+            t_idx, t_lon, inside = tables[body]
+            idx, lon, mask = np.where(inside, t_idx, idx), np.where(inside, t_lon, lon), mask & ~inside
+        out[body] = (idx, lon, mask)
+    return out
+
+
+def charts(dates, times=None, tz_offsets=0.0, bodies=BODIES, exact=None, processes=None):
+    """Bulk chart for many birth records; see charts_jd."""
+    return charts_jd(julian_days(dates, times, tz_offsets), bodies, exact, processes)
+
+
+@lru_cache(maxsize=65536)
+def _placement(jd, body, exact):
+    lon = None
+    if exact is not False and HAVE_SWE:
+        lon, used_exact = float(_swe_longitude(jd, body)), True
+        if math.isnan(lon):
+            lon = None
+    if exact is None:
+        idx, t_lon, inside = from_table(body, jd)
+        if inside:
+            # the table decides the sign at a cusp; keep an exact longitude inside it
+            lon, used_exact = (float(t_lon), False) if lon is None else (float(clamp_to_sign(idx, lon)), True)
+    if lon is None:
+        lon, used_exact = float(approx_longitudes(jd, body)), False
+    return Placement(body, ZODIAC[int(lon // 30) % 12], lon, used_exact)
+
+
+@timed("chart.chart")
+def chart(birthdate: dt.date, birthtime: dt.time = dt.time(12, 0), tz_offset: float = 0.0,
+          bodies=BODIES, exact=None):
+    """{body: Placement} for one birth moment, all from one Julian day.
+
+    Placements are memoized per (rounded Julian day, body). Raises
+    ValueError if the birth moment is not a finite time (e.g. a NaN offset).
+    """
+    jd = julian_day(birthdate, birthtime, tz_offset)
+    if not math.isfinite(jd):
+        raise ValueError("birth moment must be a finite time")
+    jd = round(jd, JD_DECIMALS)
+    return {body: _placement(jd, body, exact) for body in bodies}
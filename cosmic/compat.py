@@ -0,0 +1,122 @@
+"""Sign and element compatibility matrices for pairwise and group checks.
+
+The AuditData Enemy Signs / Avoid Elements rules are compiled once per
+workbook into small int8 matrices (0 OK, 1 MILD, 2 STRONG) using the same
+matchers as the Life Audit, so compatibility for N people is one array
+gather instead of N² text matches.
+"""
+import numpy as np
+import pandas as pd
+
+from .house import house_index
+from .profiles import sign_profiles
+
+CONFLICTS = np.array(["OK", "MILD", "STRONG"], dtype=object)
+_CODE = {"OK": 0, "MILD": 1, "STRONG": 2}
+
+
+def _codes(matcher, names):
+    if matcher is None:
+        return np.zeros(len(names), dtype=np.int8)
+    return np.array([_CODE[matcher.match(n.lower())[0]] for n in names], dtype=np.int8)
+
+
+class CompatIndex:
+    """Conflict matrices over ``signs`` (ZODIAC first) and ``elements``.
+
+    ``enemy[i, j]``: sign i lists sign j as an enemy.
+    ``avoid[i, k]``: sign i avoids element k.
+    ``element_relations[k, l]``: Element_Relations code of element k in
+    element l, as an index into ``relation_labels``.
+    """
+
+    def __init__(self, profiles, house=None):
+        self.signs = [p.sign for p in profiles]
+        self.sign_of = {}
+        for i, s in enumerate(self.signs):
+            self.sign_of.setdefault(s, i)
+            self.sign_of.setdefault(s.lower(), i)
+        sign_elements = [str(p.details.get("Element", "")).strip() for p in profiles]
+        self.elements = list(house.elements) if house is not None else []
+        self.elements += [e for e in dict.fromkeys(sign_elements) if e and e not in self.elements]
+        self.element_of = {e: k for k, e in enumerate(self.elements)}
+        self.sign_element = np.array([self.element_of.get(e, -1) for e in sign_elements], dtype=np.intp)
+
+        self.enemy = np.stack([_codes(p.matchers.get("People (Signs)"), self.signs) for p in profiles]) \
+            if profiles else np.zeros((0, 0), dtype=np.int8)
+        self.mutual = np.maximum(self.enemy, self.enemy.T)
+        self.avoid = np.stack([_codes(p.matchers.get("Elements"), self.elements) for p in profiles]) \
+            if profiles else np.zeros((0, len(self.elements)), dtype=np.int8)
+
+        self.relation_labels = list(house.labels) if house is not None else []
+        n = len(self.elements)
+        self.element_relations = np.zeros((n, n), dtype=np.int8)
+        if house is not None:
+            for k, a in enumerate(self.elements):
+                for l, b in enumerate(self.elements):
+                    self.element_relations[k, l] = house.relation_code(a, b)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        return cls(sign_profiles(snapshot), house_index(snapshot))
+
+    def sign_ids(self, signs):
+        """Row index of each sign name (case-insensitive); -1 if unknown."""
+        ids = []
+        for s in signs:
+            i = self.sign_of.get(s)
+            if i is None and isinstance(s, str):
+                i = self.sign_of.get(s.strip().lower())
+            ids.append(-1 if i is None else i)
+        return np.array(ids, dtype=np.intp)
+
+    def _elements_of(self, ids):
+        return np.where(ids >= 0, self.sign_element[np.maximum(ids, 0)], -1)
+
+    @staticmethod
+    def _gather(matrix, rows, cols):
+        if not matrix.size:
+            return np.zeros((len(rows), len(cols)), dtype=np.int8)
+        out = matrix[rows[:, None], cols[None, :]]
+        out[(rows < 0)[:, None] | (cols < 0)[None, :]] = 0
+        return out
+
+    def pairwise(self, a, b=None, directed=False):
+        """len(a) x len(b) sign conflict codes; undirected takes the worse direction."""
+        ia = self.sign_ids(a)
+        ib = ia if b is None else self.sign_ids(b)
+        return self._gather(self.enemy if directed else self.mutual, ia, ib)
+
+    def element_pairwise(self, a, b=None, directed=False):
+        """len(a) x len(b) codes for a's sign avoiding the element of b's sign."""
+        ia = self.sign_ids(a)
+        ib = ia if b is None else self.sign_ids(b)
+        out = self._gather(self.avoid, ia, self._elements_of(ib))
+        if directed:
+            return out
+        return np.maximum(out, self._gather(self.avoid, ib, self._elements_of(ia)).T)
+
+    def group(self, signs, names=None, min_level=1):
+        """(conflicting pairs, per-person summary) DataFrames for one group."""
+        signs = list(signs)
+        names = list(range(len(signs))) if names is None else list(names)
+        by_sign = self.pairwise(signs)
+        by_elem = self.element_pairwise(signs)
+        worst = np.maximum(by_sign, by_elem)
+        np.fill_diagonal(worst, 0)
+        i, j = np.nonzero(np.triu(worst >= min_level, k=1))
+        names_arr, signs_arr = np.array(names, dtype=object), np.array(signs, dtype=object)
+        pairs = pd.DataFrame({
+            "Person A": names_arr[i], "Sign A": signs_arr[i],
+            "Person B": names_arr[j], "Sign B": signs_arr[j],
+            "Signs": CONFLICTS[by_sign[i, j]], "Elements": CONFLICTS[by_elem[i, j]],
+        })
+        summary = pd.DataFrame({
+            "Person": names_arr, "Sign": signs_arr,
+            "STRONG": (worst == 2).sum(axis=1), "MILD": (worst == 1).sum(axis=1),
+        })
+        return pairs, summary
+
+
+def compat_index(snapshot):
+    return snapshot.derive(CompatIndex.from_snapshot)
@@ -0,0 +1,135 @@
+"""Precomputed sign ingress tables.
+
+The Moon table is a float64 ``.npy`` of UT Julian days at which the Moon
+enters each sign, starting with an ingress into Aries, so the sign after
+ingress ``i`` is ``i % 12`` (the Moon is never retrograde). Lookups are a
+binary search; the file is memory-mapped and shared between processes.
+
+The Sun and planets can be retrograde, so ``planet_ingress.npz`` stores,
+per body, the instants (``<Body>_jd``) and the sign entered at each
+(``<Body>_sign``); the first entry is the start of the covered range.
+
+Regenerate with ``python -m cosmic build-ephemeris`` (needs pyswisseph).
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "moon_ingress.npy")
+PLANET_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "planet_ingress.npz")
+PLANETS = ("Sun", "Mercury", "Venus", "Mars", "Jupiter", "Saturn")
+
+
+@lru_cache(maxsize=None)
+def ingress_table(path=TABLE_PATH):
+    """The memory-mapped ingress table, or None when it isn't available."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+def ingress_signs(jd, table=None):
+    """Sign index and an in-range mask for UT Julian days (exact to the table's resolution)."""
+    table = ingress_table() if table is None else table
+    jd = np.asarray(jd, dtype=float)
+    if table is None or len(table) < 2:
+        return np.zeros(jd.shape, np.int8), np.zeros(jd.shape, bool)
+    i = np.searchsorted(table, jd, side="right") - 1
+    inside = (i >= 0) & (i < len(table) - 1)
+    return (i % 12).astype(np.int8), inside
+
+
+@lru_cache(maxsize=None)
+def planet_tables(path=PLANET_TABLE_PATH):
+    """{body: (instants, signs)} from the planet table, or {} when it isn't available."""
+    try:
+        with np.load(path) as data:
+            return {b: (data[f"{b}_jd"], data[f"{b}_sign"]) for b in PLANETS if f"{b}_jd" in data}
+    except (OSError, ValueError):
+        return {}
+
+
+def planet_signs(body, jd):
+    """Sign index and an in-range mask for UT Julian days, from the planet table."""
+    jd = np.asarray(jd, dtype=float)
+    table = planet_tables().get(body)
+    if table is None or len(table[0]) < 2:
+        return np.zeros(jd.shape, np.int8), np.zeros(jd.shape, bool)
+    instants, signs = table
+    i = np.searchsorted(instants, jd, side="right") - 1
+    inside = (i >= 0) & (i < len(instants) - 1)
+    return signs[np.clip(i, 0, len(signs) - 1)], inside
+
+
+def _ingresses(lon_at, jd0, jd1, step, tol):
+    """[(instant, sign entered)] for every sign change of lon_at on [jd0, jd1].
+
+    Assumes at most one cusp crossing per grid step.
+    """
+    grid = np.arange(jd0, jd1 + step, step)
+    signs = np.array([int(lon_at(t) // 30) for t in grid])
+    out = []
+    for k in np.nonzero(signs[1:] != signs[:-1])[0]:
+        lo, hi, target = grid[k], grid[k + 1], signs[k + 1]
+        while hi - lo > tol:
+            mid = 0.5 * (lo + hi)
+            if int(lon_at(mid) // 30) == target:
+                hi = mid
+            else:
+                lo = mid
+        out.append((hi, target))
+    return out
+
+
+def build_ingress_table(start_year=1900, end_year=2100, step=0.25, tol=1e-6):
+    """Moon ingress instants from Swiss Ephemeris, covering start_year..end_year."""
+    import swisseph as swe
+
+    # start a month early so the table can begin on an Aries ingress;
+    # at 0.25 day steps the Moon moves < 4°, so each step crosses at most one cusp
+    jd0 = swe.julday(start_year, 1, 1, 0.0) - 30.0
+    jd1 = swe.julday(end_year + 1, 1, 1, 0.0) + 3.0
+    out = []
+    for jd, sign in _ingresses(lambda t: swe.calc_ut(t, swe.MOON)[0][0], jd0, jd1, step, tol):
+        if out or sign == 0:
+            out.append(jd)
+    return np.array(out, dtype=np.float64)
+
+
+def build_planet_tables(start_year=1900, end_year=2100, step=0.5, tol=1e-6):
+    """{"<Body>_jd": instants, "<Body>_sign": signs} for PLANETS from Swiss Ephemeris."""
+    import swisseph as swe
+
+    jd0 = swe.julday(start_year, 1, 1, 0.0)
+    jd1 = swe.julday(end_year + 1, 1, 1, 0.0)
+    arrays = {}
+    for body in PLANETS:
+        ipl = getattr(swe, body.upper())
+
+        def lon_at(t, ipl=ipl):
+            return swe.calc_ut(t, ipl)[0][0]
+
+        # the range opens with the sign held at jd0 and closes at jd1
+        rows = [(jd0, int(lon_at(jd0) // 30))] + _ingresses(lon_at, jd0, jd1, step, tol)
+        rows.append((jd1, int(lon_at(jd1) // 30)))
+        arrays[f"{body}_jd"] = np.array([r[0] for r in rows], dtype=np.float64)
+        arrays[f"{body}_sign"] = np.array([r[1] for r in rows], dtype=np.int8)
+    return arrays
+
+
+def write_ingress_table(path=TABLE_PATH, **kwargs):
+    table = build_ingress_table(**kwargs)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, table)
+    ingress_table.cache_clear()
+    return table
+
+
+def write_planet_tables(path=PLANET_TABLE_PATH, **kwargs):
+    arrays = build_planet_tables(**kwargs)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(path, **arrays)
+    planet_tables.cache_clear()
+    return arrays
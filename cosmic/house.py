@@ -0,0 +1,144 @@
+"""House Zone Checker lookups, indexed once per workbook snapshot."""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+NEUTRAL = "Neutral"
+# Known relation labels first so codes sort from best to worst; anything
+# else found in Element_Relations is appended after them.
+RELATIONS = ["Neutral", "Supportive", "Mild Support", "Mild Avoid", "Avoid (Strong)"]
+CENTRE = "Centre"
+
+
+@dataclass(frozen=True)
+class ZoneVerdict:
+    item_elem: str
+    zone_primary: str
+    relation: str
+    remedy: str
+    shape_elem: str = ""
+    shape_relation: str = ""
+    recommended_shapes: str = ""
+
+
+def _text(v):
+    return "" if v is None or pd.isna(v) else str(v)
+
+
+def _first_map(df, key_col, value_col):
+    if df.empty or key_col not in df.columns or value_col not in df.columns:
+        return {}
+    out = {}
+    for k, v in zip(df[key_col], df[value_col]):
+        if not pd.isna(k):
+            out.setdefault(k, _text(v))
+    return out
+
+
+def primary_element(zone_elem):
+    return str(zone_elem).split("+")[0].strip() if zone_elem else ""
+
+
+class HouseIndex:
+    """Dict/array lookups replacing the per-check DataFrame masks.
+
+    ``codes[i, j]`` is the relation of element ``elements[i]`` (a row of
+    Element_Relations) placed in a zone of element ``columns[j]``, as an
+    index into ``labels``; 0 means Neutral / not listed.
+    """
+
+    def __init__(self, df_elem_items, df_zones, df_rel, df_pref, df_shapes):
+        self.item_element = _first_map(df_elem_items, "Item Name", "Element")
+        self.zone_primary = {z: primary_element(e) for z, e in _first_map(df_zones, "Zone", "Primary Element").items()}
+        self.shape_element = _first_map(df_shapes, "Shape", "Element")
+        self.best_zones = _first_map(df_pref, "Element", "Best Zones")
+        self.has_preferences = not df_pref.empty
+        self.shapes_by_element = {}
+        if not df_shapes.empty and {"Shape", "Element"} <= set(df_shapes.columns):
+            for shape, elem in zip(df_shapes["Shape"], df_shapes["Element"]):
+                if not pd.isna(shape) and not pd.isna(elem):
+                    self.shapes_by_element.setdefault(elem, []).append(shape)
+
+        self.labels = list(RELATIONS)
+        self.elements, self.columns = [], []
+        self.codes = np.zeros((0, 0), dtype=np.int8)
+        if not df_rel.empty and df_rel.shape[1] > 1:
+            self.columns = [c for c in df_rel.columns[1:]]
+            rows = {}
+            for values in df_rel.itertuples(index=False):
+                if not pd.isna(values[0]):
+                    rows.setdefault(values[0], values[1:])
+            self.elements = list(rows)
+            self.codes = np.zeros((len(self.elements), len(self.columns)), dtype=np.int8)
+            for i, values in enumerate(rows.values()):
+                for j, v in enumerate(values):
+                    label = _text(v)
+                    if not label:
+                        continue
+                    if label not in self.labels:
+                        self.labels.append(label)
+                    self.codes[i, j] = self.labels.index(label)
+        self.row_of = {e: i for i, e in enumerate(self.elements)}
+        self.col_of = {c: j for j, c in enumerate(self.columns)}
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        return cls(
+            snapshot.sheet("Element_Items"),
+            snapshot.sheet("House_Zones"),
+            snapshot.sheet("Element_Relations"),
+            snapshot.sheet("Element_Preferences"),
+            snapshot.sheet("Shape_Elements"),
+        )
+
+    def relation_code(self, elem, zone_elem):
+        i, j = self.row_of.get(elem), self.col_of.get(zone_elem)
+        return 0 if i is None or j is None else int(self.codes[i, j])
+
+    def relation(self, elem, zone_elem):
+        return self.labels[self.relation_code(elem, zone_elem)]
+
+    def remedy(self, item_elem, zone, rel):
+        if zone == CENTRE and item_elem != "Space":
+            return "Keep centre open — relocate item to its best zones"
+        if rel.startswith("Avoid"):
+            if self.has_preferences:
+                return f"Move to: {self.best_zones.get(item_elem, '')}"
+            return "Move to a better-suited zone for the item's element"
+        if rel == "Mild Avoid":
+            return "Balance with supportive colours/crystals of the zone element or relocate later"
+        return "OK / Supportive — keep as is"
+
+    def verdict(self, item, zone, shape=""):
+        item_elem = self.item_element.get(item, "")
+        zone_primary = self.zone_primary.get(zone, "")
+        rel = self.relation(item_elem, zone_primary)
+        shape_elem = shape_rel = rec_shapes = ""
+        if shape and self.shape_element:
+            if shape in self.shape_element:
+                shape_elem = self.shape_element[shape]
+                shape_rel = self.relation(shape_elem, zone_primary) if shape_elem in self.row_of else ""
+            rec_shapes = ", ".join(self.shapes_by_element.get(zone_primary, [])[:10])
+        return ZoneVerdict(item_elem, zone_primary, rel, self.remedy(item_elem, zone, rel), shape_elem, shape_rel, rec_shapes)
+
+    def compatibility_codes(self, items, zones):
+        """Relation codes for every (item, zone) pair as an int8 array, in one gather."""
+        rows = np.array([self.row_of.get(self.item_element.get(i), -1) for i in items], dtype=np.intp)
+        cols = np.array([self.col_of.get(self.zone_primary.get(z), -1) for z in zones], dtype=np.intp)
+        if not self.codes.size:
+            return np.zeros((len(rows), len(cols)), dtype=np.int8)
+        out = self.codes[rows[:, None], cols[None, :]]
+        out[(rows < 0)[:, None] | (cols < 0)[None, :]] = 0
+        return out
+
+    def compatibility_matrix(self, items=None, zones=None):
+        """Items x zones DataFrame of relation labels (whole-house report)."""
+        items = list(self.item_element) if items is None else list(items)
+        zones = list(self.zone_primary) if zones is None else list(zones)
+        codes = self.compatibility_codes(items, zones)
+        return pd.DataFrame(np.array(self.labels, dtype=object)[codes], index=items, columns=zones)
+
+
+def house_index(snapshot):
+    return snapshot.derive(HouseIndex.from_snapshot)
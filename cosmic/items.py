@@ -0,0 +1,89 @@
+"""Element_Items catalog indexes for the Items Browser."""
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+ALL = "All"
+
+
+def _words(text):
+    return re.findall(r"\w+", str(text).lower())
+
+
+class ItemCatalog:
+    """Element/Category group indexes and a word index over item names.
+
+    Filters return arrays of row positions, cached per (element, category,
+    query), so paging through a result never copies the frame; only the
+    visible page is materialized.
+    """
+
+    def __init__(self, df, name_col="Item Name", group_cols=("Element", "Category")):
+        self.df = df
+        self.groups = {}
+        self.options = {}
+        for col in group_cols:
+            if col not in df.columns:
+                continue
+            codes = pd.Categorical(df[col])
+            self.options[col] = [c for c in codes.categories.tolist() if c]
+            positions = np.argsort(codes.codes, kind="stable")
+            bounds = np.searchsorted(codes.codes[positions], np.arange(len(codes.categories) + 1))
+            self.groups[col] = {cat: self._frozen(positions[bounds[k]:bounds[k + 1]])
+                                for k, cat in enumerate(codes.categories)}
+        postings = {}
+        if name_col in df.columns:
+            for pos, name in enumerate(df[name_col]):
+                if isinstance(name, str):
+                    for w in set(_words(name)):
+                        postings.setdefault(w, []).append(pos)
+        self.words = sorted(postings)
+        self.postings = [np.array(postings[w], dtype=np.intp) for w in self.words]
+        self.filter = lru_cache(maxsize=256)(self._filter)
+
+    @staticmethod
+    def _frozen(rows):
+        rows = np.asarray(rows, dtype=np.intp)
+        rows.flags.writeable = False
+        return rows
+
+    def search(self, query):
+        """Rows whose name has, for every query word, a word starting with it."""
+        rows = None
+        for q in _words(query):
+            lo = bisect_left(self.words, q)
+            hi = lo
+            while hi < len(self.words) and self.words[hi].startswith(q):
+                hi += 1
+            hits = np.unique(np.concatenate(self.postings[lo:hi])) if hi > lo else np.empty(0, np.intp)
+            rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+            if not len(rows):
+                break
+        return rows
+
+    def _filter(self, element=ALL, category=ALL, query=""):
+        rows = None
+        for col, value in (("Element", element), ("Category", category)):
+            if value != ALL and col in self.groups:
+                hits = self.groups[col].get(value, np.empty(0, np.intp))
+                rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+        if query.strip():
+            hits = self.search(query)
+            if hits is not None:
+                rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+        return self._frozen(np.arange(len(self.df)) if rows is None else rows)
+
+    def page(self, rows, page=1, page_size=50):
+        start = max(page - 1, 0) * page_size
+        return self.df.iloc[rows[start:start + page_size]]
+
+
+def item_catalog(snapshot):
+    return snapshot.derive(_item_catalog)
+
+
+def _item_catalog(snapshot):
+    return ItemCatalog(snapshot.sheet("Element_Items"))
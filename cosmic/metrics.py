@@ -0,0 +1,203 @@
+"""Lightweight timing and cache instrumentation.
+
+``timed(name)`` (context manager or decorator) records wall time and call
+counts; ``record_cache(name, hit)`` counts cache hits/misses. Everything is
+aggregated process-wide in REGISTRY and, between ``start_rerun()`` and
+``finish_rerun()``, also per Streamlit rerun (tracked in a ContextVar, so
+concurrent sessions don't mix).
+
+Environment:
+    COSMIC_METRICS_JSONL  append one JSON line per finished rerun
+    COSMIC_METRICS_PROM   rewrite a Prometheus text file with the aggregates
+                          (at most every COSMIC_METRICS_PROM_INTERVAL seconds, default 5)
+"""
+import json
+import os
+import threading
+import time
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
+
+
+class _Stats:
+    """Span timings and cache counters; shared by the registry and reruns."""
+
+    def __init__(self):
+        self.spans = {}   # name -> [calls, total seconds, max seconds]
+        self.caches = {}  # name -> [hits, misses]
+
+    def add_span(self, name, seconds):
+        s = self.spans.get(name)
+        if s is None:
+            self.spans[name] = [1, seconds, seconds]
+        else:
+            s[0] += 1
+            s[1] += seconds
+            s[2] = max(s[2], seconds)
+
+    def add_cache(self, name, hit):
+        c = self.caches.setdefault(name, [0, 0])
+        c[0 if hit else 1] += 1
+
+    def span_rows(self):
+        return [(name, calls, total, peak) for name, (calls, total, peak) in sorted(self.spans.items())]
+
+    def cache_rows(self):
+        return [(name, hits, misses) for name, (hits, misses) in sorted(self.caches.items())]
+
+
+class Rerun(_Stats):
+    def __init__(self, label=""):
+        super().__init__()
+        self.label = label
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.seconds = None
+
+    def as_dict(self):
+        return {
+            "ts": round(self.started, 3),
+            "label": self.label,
+            "seconds": self.seconds,
+            "spans": {n: {"calls": c, "seconds": round(t, 6), "max": round(m, 6)} for n, c, t, m in self.span_rows()},
+            "caches": {n: {"hits": h, "misses": m} for n, h, m in self.cache_rows()},
+        }
+
+
+class Registry(_Stats):
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.reruns = 0
+        self.rerun_seconds = 0.0
+        self._prom_written = 0.0
+
+    def add_span(self, name, seconds):
+        with self.lock:
+            super().add_span(name, seconds)
+
+    def add_cache(self, name, hit):
+        with self.lock:
+            super().add_cache(name, hit)
+
+    def prometheus_text(self):
+        with self.lock:
+            spans, caches = self.span_rows(), self.cache_rows()
+            reruns, rerun_seconds = self.reruns, self.rerun_seconds
+        lines = [
+            "# HELP cosmic_reruns_total Finished app reruns.",
+            "# TYPE cosmic_reruns_total counter",
+            f"cosmic_reruns_total {reruns}",
+            "# HELP cosmic_rerun_seconds_total Wall time spent in app reruns.",
+            "# TYPE cosmic_rerun_seconds_total counter",
+            f"cosmic_rerun_seconds_total {rerun_seconds:.6f}",
+            "# HELP cosmic_span_calls_total Calls per instrumented span.",
+            "# TYPE cosmic_span_calls_total counter",
+        ]
+        lines += [f'cosmic_span_calls_total{{span="{n}"}} {c}' for n, c, _, _ in spans]
+        lines += ["# HELP cosmic_span_seconds_total Wall time per instrumented span.",
+                  "# TYPE cosmic_span_seconds_total counter"]
+        lines += [f'cosmic_span_seconds_total{{span="{n}"}} {t:.6f}' for n, _, t, _ in spans]
+        lines += ["# HELP cosmic_span_seconds_max Slowest single call per span.",
+                  "# TYPE cosmic_span_seconds_max gauge"]
+        lines += [f'cosmic_span_seconds_max{{span="{n}"}} {m:.6f}' for n, _, _, m in spans]
+        lines += ["# HELP cosmic_cache_requests_total Cache lookups by result.",
+                  "# TYPE cosmic_cache_requests_total counter"]
+        for n, hits, misses in caches:
+            lines.append(f'cosmic_cache_requests_total{{cache="{n}",result="hit"}} {hits}')
+            lines.append(f'cosmic_cache_requests_total{{cache="{n}",result="miss"}} {misses}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+_rerun = ContextVar("cosmic_rerun", default=None)
+_lookup = ContextVar("cosmic_cache_lookup", default=None)
+
+
+class timed(ContextDecorator):
+    """Time a block or function under ``name``."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _recreate_cm(self):
+        # fresh instance per decorated call, so concurrent calls don't share _t0
+        return timed(self.name)
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._t0
+        REGISTRY.add_span(self.name, seconds)
+        run = _rerun.get()
+        if run is not None:
+            run.add_span(self.name, seconds)
+        return False
+
+
+def record_cache(name, hit):
+    REGISTRY.add_cache(name, hit)
+    run = _rerun.get()
+    if run is not None:
+        run.add_cache(name, hit)
+
+
+@contextmanager
+def cache_lookup(name):
+    """Count a call to a memoized function as a hit unless its body calls mark_miss()."""
+    state = {"miss": False}
+    token = _lookup.set(state)
+    try:
+        yield
+    finally:
+        _lookup.reset(token)
+        record_cache(name, not state["miss"])
+
+
+def mark_miss():
+    state = _lookup.get()
+    if state is not None:
+        state["miss"] = True
+
+
+def start_rerun(label=""):
+    run = Rerun(label)
+    _rerun.set(run)
+    return run
+
+
+def current_rerun():
+    return _rerun.get()
+
+
+def finish_rerun(run):
+    run.seconds = round(time.perf_counter() - run._t0, 6)
+    if _rerun.get() is run:
+        _rerun.set(None)
+    with REGISTRY.lock:
+        REGISTRY.reruns += 1
+        REGISTRY.rerun_seconds += run.seconds
+        write_prom = False
+        prom = os.environ.get("COSMIC_METRICS_PROM")
+        interval = float(os.environ.get("COSMIC_METRICS_PROM_INTERVAL", 5))
+        if prom and time.time() - REGISTRY._prom_written >= interval:
+            REGISTRY._prom_written = time.time()
+            write_prom = True
+    jsonl = os.environ.get("COSMIC_METRICS_JSONL")
+    try:
+        if jsonl:
+            with open(jsonl, "a") as f:
+                f.write(json.dumps(run.as_dict()) + "\n")
+        if write_prom:
+            REGISTRY.write_prometheus(prom)
+    except OSError:
+        pass  # metrics must never break the app
+    return run
@@ -0,0 +1,116 @@
+"""Whole-house placement: assign an item inventory to house zones.
+
+An item's cost in a zone depends only on its element, so the problem is a
+small transportation problem (elements -> zones with capacities) solved as
+a min-cost flow; items of an element are then dealt out by the flow
+amounts. Hundreds of items cost the same as a handful.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .house import CENTRE, house_index
+
+# Penalty per item by relation label; unlisted labels count as Neutral.
+RELATION_COST = {"Supportive": 0, "Mild Support": 1, "Neutral": 2, "Mild Avoid": 10, "Avoid (Strong)": 100}
+
+
+def min_cost_flow(n, edges, s, t):
+    """Successive shortest paths (Bellman-Ford) on a small graph.
+
+    edges: (u, v, capacity, cost) tuples. Returns (flow per edge, total flow).
+    """
+    graph = [[] for _ in range(n)]
+    # residual arcs: [to, capacity, cost, index of reverse arc]
+    arcs = []
+    for u, v, cap, cost in edges:
+        graph[u].append(len(arcs)); arcs.append([v, cap, cost, len(arcs) + 1])
+        graph[v].append(len(arcs)); arcs.append([u, 0, -cost, len(arcs) - 1])
+    total = 0
+    while True:
+        dist = [float("inf")] * n
+        prev = [-1] * n
+        dist[s] = 0
+        for _ in range(n - 1):
+            changed = False
+            for u in range(n):
+                if dist[u] == float("inf"):
+                    continue
+                for a in graph[u]:
+                    v, cap, cost, _ = arcs[a]
+                    if cap > 0 and dist[u] + cost < dist[v]:
+                        dist[v] = dist[u] + cost
+                        prev[v] = a
+                        changed = True
+            if not changed:
+                break
+        if dist[t] == float("inf"):
+            break
+        push, v = float("inf"), t
+        while v != s:
+            a = prev[v]
+            push = min(push, arcs[a][1])
+            v = arcs[arcs[a][3]][0]
+        v = t
+        while v != s:
+            a = prev[v]
+            arcs[a][1] -= push
+            arcs[arcs[a][3]][1] += push
+            v = arcs[arcs[a][3]][0]
+        total += push
+    flows = [arcs[2 * k + 1][1] for k in range(len(edges))]
+    return flows, total
+
+
+def optimize_placement(index, inventory, capacities=None, keep_centre_open=True, zones=None):
+    """Assign every item in ``inventory`` (names, repeats allowed) to a zone.
+
+    capacities: None (unlimited), an int for every zone, or {zone: int}.
+    With keep_centre_open, only Space items may go to the Centre. Minimizes
+    the total RELATION_COST; raises ValueError if the items don't fit.
+    """
+    zones = list(index.zone_primary) if zones is None else list(zones)
+    if not zones:
+        raise ValueError("No house zones to place items in")
+    inventory = list(inventory)
+    n_items = len(inventory)
+    if isinstance(capacities, dict):
+        caps = [int(capacities.get(z, n_items)) for z in zones]
+    else:
+        caps = [n_items if capacities is None else int(capacities)] * len(zones)
+
+    elements = list(dict.fromkeys(index.item_element.get(item, "") for item in inventory))
+    supply = Counter(index.item_element.get(item, "") for item in inventory)
+    cost = np.array([[RELATION_COST.get(index.relation(e, index.zone_primary.get(z, "")), RELATION_COST["Neutral"])
+                      for z in zones] for e in elements], dtype=np.int64)
+
+    # nodes: source, elements, zones, sink
+    s, t = 0, 1 + len(elements) + len(zones)
+    edges = [(s, 1 + i, supply[e], 0) for i, e in enumerate(elements)]
+    pair_edges = []
+    for i, e in enumerate(elements):
+        for j, z in enumerate(zones):
+            if keep_centre_open and z == CENTRE and e != "Space":
+                continue
+            pair_edges.append((i, j, len(edges)))
+            edges.append((1 + i, 1 + len(elements) + j, n_items, int(cost[i, j])))
+    edges += [(1 + len(elements) + j, t, cap, 0) for j, cap in enumerate(caps)]
+    flows, total = min_cost_flow(t + 1, edges, s, t)
+    if total < n_items:
+        raise ValueError(f"Only {total} of {n_items} items fit within the zone capacities")
+
+    slots = {e: [] for e in elements}
+    for i, j, k in pair_edges:
+        slots[elements[i]] += [zones[j]] * flows[k]
+    rows = []
+    for item in inventory:
+        elem = index.item_element.get(item, "")
+        zone = slots[elem].pop()
+        rel = index.relation(elem, index.zone_primary.get(zone, ""))
+        rows.append((item, elem, zone, rel, RELATION_COST.get(rel, RELATION_COST["Neutral"])))
+    return pd.DataFrame(rows, columns=["Item", "Element", "Zone", "Relation", "Cost"])
+
+
+def plan_house(snapshot, inventory, capacities=None, keep_centre_open=True):
+    return optimize_placement(house_index(snapshot), inventory, capacities, keep_centre_open)
@@ -0,0 +1,77 @@
+"""Per-sign profiles: everything the app needs about one sign, built once per workbook."""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .astro import ZODIAC
+from .audit import AUDIT_CATEGORIES, TermMatcher, audit_matchers, audit_rows, category_fixes, sign_data_rows
+
+SIGN_INDEX = {sign: i for i, sign in enumerate(ZODIAC)}
+
+
+@dataclass(frozen=True)
+class SignProfile:
+    """One sign's Data fields, AuditData matchers and remedy text.
+
+    details holds the non-empty Data sheet fields as plain Python values;
+    matchers is empty when the sign has no AuditData row. remedies maps a
+    category label to its (strong, mild) fix text.
+    """
+    # explicit rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("sign", "index", "details", "matchers", "remedies")
+    sign: str
+    index: int
+    details: Mapping[str, object]
+    matchers: Mapping[str, TermMatcher]
+    remedies: Mapping[str, tuple]
+
+    def remedy(self, label, strong_hits, mild_hits):
+        strong, mild = self.remedies.get(label, ("", ""))
+        return strong if strong_hits > 0 else (mild if mild_hits > 0 else "")
+
+    def audit(self, label, user_text):
+        """Same as audit.audit_category, with the remedy text looked up."""
+        results, strong_hits, mild_hits = audit_rows(self.matchers[label], label, user_text)
+        return results, (label, strong_hits, mild_hits, self.remedy(label, strong_hits, mild_hits))
+
+
+def _value(v):
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def build_profile(sign, index, drow, matchers):
+    details = {}
+    if drow is not None:
+        details = {k: _value(v) for k, v in drow.items() if pd.notna(v) and str(v) != ""}
+    remedies = {
+        label: (", ".join(category_fixes(label, 1, 0, drow)), ", ".join(category_fixes(label, 0, 1, drow)))
+        for (label, *_rest) in AUDIT_CATEGORIES
+    }
+    return SignProfile(sign, index, MappingProxyType(details), MappingProxyType(matchers or {}),
+                       MappingProxyType(remedies))
+
+
+def sign_profiles(snapshot):
+    """Profiles in ZODIAC order, then any other signs the workbook names."""
+    return snapshot.derive(_sign_profiles)
+
+
+def _sign_profiles(snapshot):
+    matchers = audit_matchers(snapshot)
+    data_rows = sign_data_rows(snapshot)
+    signs = list(ZODIAC) + [s for s in {**data_rows, **matchers} if isinstance(s, str) and s not in SIGN_INDEX]
+    return tuple(build_profile(s, i, data_rows.get(s), matchers.get(s)) for i, s in enumerate(signs))
+
+
+def sign_profile(snapshot, sign) -> Optional[SignProfile]:
+    profiles = sign_profiles(snapshot)
+    i = SIGN_INDEX.get(sign)
+    if i is not None:
+        return profiles[i]
+    for profile in profiles[len(ZODIAC):]:
+        if profile.sign == sign:
+            return profile
+    return None
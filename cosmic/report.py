@@ -0,0 +1,95 @@
+"""Headless profile reports: everything the app shows, as plain JSON-able data.
+
+No Streamlit here; the app, the CLI and the HTTP service share these
+functions and a preloaded WorkbookSnapshot.
+"""
+import datetime as dt
+
+import numpy as np
+
+from .audit import AUDIT_CATEGORIES
+from .chart import chart
+from .house import house_index
+from .items import item_catalog
+from .metrics import timed
+from .profiles import sign_profile, sign_profiles
+from .timing import day_verdict, guide_rules
+
+
+def _plain(v):
+    if isinstance(v, np.generic):
+        return v.item()
+    if isinstance(v, (dt.date, dt.time)):
+        return v.isoformat()
+    return v
+
+
+def warm(snapshot):
+    """Build every per-workbook index up front (e.g. before serving requests)."""
+    sign_profiles(snapshot)
+    guide_rules(snapshot)
+    house_index(snapshot)
+    item_catalog(snapshot)
+    return snapshot
+
+
+def sign_details(snapshot, sign):
+    """Non-empty Data sheet fields for a sign."""
+    profile = sign_profile(snapshot, sign)
+    if profile is None:
+        return {}
+    return {k: _plain(v) for k, v in profile.details.items()}
+
+
+def life_audit(snapshot, sign, texts):
+    """Token results and category summary for {category label: user text}."""
+    profile = sign_profile(snapshot, sign)
+    results, summary = [], []
+    if profile is None or not profile.matchers:
+        return results, summary
+    for (label, *_rest) in AUDIT_CATEGORIES:
+        with timed("life_audit.category"):
+            rows, summary_row = profile.audit(label, texts.get(label, ""))
+        results.extend(rows)
+        summary.append(summary_row)
+    return results, summary
+
+
+def profile_report(snapshot, birthdate, birthtime=dt.time(12, 0), tz_offset=0.0, use="Sun",
+                   audit=None, activity=None, date=None, item=None, zone=None, shape="", keep_master=True):
+    placements = chart(birthdate, birthtime, tz_offset)
+    sun, moon = placements["Sun"], placements["Moon"]
+    selected_sign = sun.sign if use == "Sun" else moon.sign
+    report = {
+        "birthdate": birthdate.isoformat(),
+        "birthtime": birthtime.isoformat(),
+        "tz_offset": tz_offset,
+        "sun_sign": sun.sign,
+        "moon_sign": moon.sign,
+        "moon_longitude": round(moon.longitude, 4),
+        "moon_exact": moon.exact,
+        "chart": {p.body: {"sign": p.sign, "longitude": round(p.longitude, 4), "exact": p.exact}
+                  for p in placements.values()},
+        "selected_sign": selected_sign,
+        "details": sign_details(snapshot, selected_sign),
+    }
+
+    results, summary = life_audit(snapshot, selected_sign, audit or {})
+    report["audit"] = {
+        "results": [dict(zip(("category", "token", "conflict", "matched_term"), r)) for r in results],
+        "summary": [dict(zip(("category", "strong", "mild", "fixes"), r)) for r in summary],
+    }
+
+    report["timing"] = None
+    rule = guide_rules(snapshot).get(activity) if activity else None
+    if rule is not None:
+        date = date or dt.date.today()
+        wd, ud, afit, nfit, verdict = day_verdict(rule, date, keep_master=keep_master)
+        report["timing"] = {"activity": activity, "date": date.isoformat(), "weekday": wd, "universal_day": int(ud),
+                            "astrology_fit": afit, "numerology_fit": nfit, "verdict": verdict, "notes": rule.notes}
+
+    report["house"] = None
+    if item and zone:
+        v = house_index(snapshot).verdict(item, zone, shape or "")
+        report["house"] = {"item": item, "zone": zone, "shape": shape or "", **v.__dict__}
+    return report
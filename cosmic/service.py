@@ -0,0 +1,175 @@
+"""JSON HTTP service for profile reports (a plain ASGI app, no framework).
+
+    GET  /health                -> {"status": "ok", "workbook": <sha256>}
+    POST /report  {json body}   -> profile_report(...)
+    GET  /report?birthdate=...  -> same, from query parameters
+
+Body / query fields: birthdate (YYYY-MM-DD, required), birthtime (HH:MM),
+tz_offset (hours, within ±14), use ("Sun"/"Moon"), audit ({category label:
+text}), activity, date, item, zone, shape (strings), keep_master. Invalid
+fields get a 400; any other failure a JSON 500.
+
+Run with ``python -m cosmic serve`` (needs uvicorn). Each worker loads the
+workbook snapshot once at startup and shares it across requests.
+"""
+import datetime as dt
+import json
+import logging
+import math
+import os
+from urllib.parse import parse_qsl
+
+from .report import profile_report, warm
+from .workbook import open_snapshot, read_default_workbook
+
+MAX_BODY = 1 << 20
+MAX_TZ_HOURS = 14.0
+
+log = logging.getLogger(__name__)
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _date(v, name):
+    try:
+        return dt.date.fromisoformat(str(v))
+    except ValueError:
+        raise BadRequest(f"{name} must be YYYY-MM-DD")
+
+
+def _time(v):
+    try:
+        return dt.time.fromisoformat(str(v))
+    except ValueError:
+        raise BadRequest("birthtime must be HH:MM[:SS]")
+
+
+def _text(v, name):
+    if v is not None and not isinstance(v, str):
+        raise BadRequest(f"{name} must be a string")
+    return v
+
+
+_TRUE = ("1", "true", "yes", "on", "y", "t")
+_FALSE = ("0", "false", "no", "off", "n", "f", "")
+
+
+def _bool(v, name):
+    if isinstance(v, bool):
+        return v
+    text = str(v).strip().lower() if isinstance(v, (str, int)) else None
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise BadRequest(f"{name} must be true or false")
+
+
+def report_args(params):
+    """Validate request fields into profile_report keyword arguments."""
+    if "birthdate" not in params:
+        raise BadRequest("birthdate is required")
+    audit = params.get("audit") or {}
+    if isinstance(audit, str):
+        try:
+            audit = json.loads(audit)
+        except ValueError:
+            raise BadRequest("audit must be a JSON object")
+    if not isinstance(audit, dict):
+        raise BadRequest("audit must be an object of {category: text}")
+    use = params.get("use", "Sun")
+    if use not in ("Sun", "Moon"):
+        raise BadRequest("use must be 'Sun' or 'Moon'")
+    try:
+        tz_offset = float(params.get("tz_offset", 0.0))
+    except (TypeError, ValueError):
+        raise BadRequest("tz_offset must be a number of hours")
+    if not math.isfinite(tz_offset) or abs(tz_offset) > MAX_TZ_HOURS:
+        raise BadRequest(f"tz_offset must be within ±{MAX_TZ_HOURS:g} hours")
+    return dict(
+        birthdate=_date(params["birthdate"], "birthdate"),
+        birthtime=_time(params.get("birthtime", "12:00")),
+        tz_offset=tz_offset,
+        use=use,
+        audit={str(k): _text(v, f"audit[{k!r}]") or "" for k, v in audit.items()},
+        activity=_text(params.get("activity"), "activity"),
+        date=_date(params["date"], "date") if params.get("date") else None,
+        item=_text(params.get("item"), "item"),
+        zone=_text(params.get("zone"), "zone"),
+        shape=_text(params.get("shape"), "shape") or "",
+        keep_master=_bool(params.get("keep_master", True), "keep_master"),
+    )
+
+
+class ReportService:
+    def __init__(self, snapshot):
+        self.snapshot = warm(snapshot)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        status, payload = await self.handle(scope, receive)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json; charset=utf-8"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def handle(self, scope, receive):
+        path, method = scope["path"].rstrip("/") or "/", scope["method"]
+        if path == "/health":
+            return 200, {"status": "ok", "workbook": self.snapshot.key}
+        if path != "/report":
+            return 404, {"error": "not found"}
+        try:
+            if method == "GET":
+                params = dict(parse_qsl(scope.get("query_string", b"").decode("utf-8")))
+            elif method == "POST":
+                try:
+                    params = json.loads(await self._body(receive) or b"{}")
+                except ValueError:
+                    raise BadRequest("invalid JSON body")
+                if not isinstance(params, dict):
+                    raise BadRequest("body must be a JSON object")
+            else:
+                return 405, {"error": "method not allowed"}
+            return 200, profile_report(self.snapshot, **report_args(params))
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+        except Exception:
+            log.exception("report failed")
+            return 500, {"error": "internal error"}
+
+    @staticmethod
+    async def _body(receive):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY:
+                raise BadRequest("request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+
+def create_app():
+    """ASGI app factory; COSMIC_WORKBOOK selects a workbook other than the bundled one."""
+    path = os.environ.get("COSMIC_WORKBOOK")
+    if path:
+        with open(path, "rb") as f:
+            raw = f.read()
+    else:
+        raw = read_default_workbook()
+    return ReportService(open_snapshot(raw))
@@ -0,0 +1,135 @@
+"""On-disk Arrow cache of parsed workbook sheets, keyed by workbook sha256.
+
+Layout: ``<cache dir>/<key>/manifest.json`` plus one uncompressed Arrow IPC
+file per sheet, which is memory-mapped on read. Entries are evicted least
+recently used first once the cache exceeds its size or entry budget.
+
+Environment:
+    COSMIC_CACHE_DIR          cache location ("" disables the cache)
+    COSMIC_CACHE_MAX_BYTES    total size budget (default 512 MiB)
+    COSMIC_CACHE_MAX_ENTRIES  number of workbooks kept (default 64)
+"""
+import json
+import os
+import shutil
+import tempfile
+
+try:
+    import pyarrow as pa
+    HAVE_ARROW = True
+except Exception:
+    HAVE_ARROW = False
+
+FORMAT_VERSION = 2
+MANIFEST = "manifest.json"
+
+
+def cache_dir():
+    path = os.environ.get("COSMIC_CACHE_DIR")
+    if path is None:
+        path = os.path.join(os.path.expanduser("~"), ".cache", "cosmic_generator")
+    return path or None
+
+
+def _limits():
+    max_bytes = int(os.environ.get("COSMIC_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+    max_entries = int(os.environ.get("COSMIC_CACHE_MAX_ENTRIES", 64))
+    return max_bytes, max_entries
+
+
+def _entry_size(path):
+    total = 0
+    for name in os.listdir(path):
+        try:
+            total += os.path.getsize(os.path.join(path, name))
+        except OSError:
+            pass
+    return total
+
+
+def read_sheets(key, root=None):
+    """Return {sheet name: DataFrame} for a cached workbook, or None on a miss."""
+    root = root or cache_dir()
+    if not HAVE_ARROW or not root:
+        return None
+    entry = os.path.join(root, key)
+    try:
+        with open(os.path.join(entry, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != FORMAT_VERSION:
+            return None
+        sheets = {}
+        for sheet in manifest["sheets"]:
+            with pa.memory_map(os.path.join(entry, sheet["file"])) as source:
+                df = pa.ipc.open_file(source).read_all().to_pandas()
+            df.columns = sheet["columns"]
+            sheets[sheet["name"]] = df
+        os.utime(entry)  # LRU bookkeeping
+        return sheets
+    except (OSError, ValueError, KeyError, pa.ArrowException):
+        return None
+
+
+def write_sheets(key, sheets, root=None):
+    """Store parsed sheets under ``key``; returns False if they can't be cached."""
+    root = root or cache_dir()
+    if not HAVE_ARROW or not root:
+        return False
+    entry = os.path.join(root, key)
+    if os.path.isdir(entry):
+        return True
+    tmp = None
+    try:
+        os.makedirs(root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=root)
+        manifest = {"version": FORMAT_VERSION, "sheets": []}
+        for i, (name, df) in enumerate(sheets.items()):
+            fname = f"{i}.arrow"
+            # Arrow needs unique string column names; the real ones (which may
+            # be None, e.g. the corner cell of Element_Relations) go in the manifest.
+            frame = df.set_axis([f"c{j}" for j in range(df.shape[1])], axis=1)
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            with pa.OSFile(os.path.join(tmp, fname), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            manifest["sheets"].append({"name": name, "file": fname, "columns": list(df.columns)})
+        with open(os.path.join(tmp, MANIFEST), "w") as f:
+            json.dump(manifest, f)
+        os.rename(tmp, entry)
+        tmp = None
+    except (OSError, TypeError, ValueError, pa.ArrowException):
+        # a concurrent writer won the rename, or a column has mixed types
+        return os.path.isdir(entry)
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+    evict(root)
+    return True
+
+
+def evict(root=None, max_bytes=None, max_entries=None):
+    """Drop least recently used entries beyond the size/entry budget."""
+    root = root or cache_dir()
+    if not root or not os.path.isdir(root):
+        return []
+    default_bytes, default_entries = _limits()
+    max_bytes = default_bytes if max_bytes is None else max_bytes
+    max_entries = default_entries if max_entries is None else max_entries
+    entries = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name.startswith(".") or not os.path.isdir(path):
+            continue
+        try:
+            entries.append((os.path.getmtime(path), _entry_size(path), path))
+        except OSError:
+            pass
+    entries.sort(reverse=True)
+    removed, total = [], 0
+    for n, (_, size, path) in enumerate(entries):
+        total += size
+        if n >= max_entries or total > max_bytes:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
@@ -0,0 +1,173 @@
+"""Activity Timing: weekday/universal-day scoring against Activity_Day_Guide."""
+import datetime as dt
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .astro import universal_day_number
+
+WEEKDAYS = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
+_WEEKDAY_NAMES = [w.lower() for w in WEEKDAYS]
+
+VERDICTS = ["Weak / Reschedule Suggested", "Moderate Timing", "Strong Cosmic Timing"]
+
+
+@dataclass(frozen=True)
+class GuideRule:
+    activity: str
+    good_days: frozenset
+    avoid_days: frozenset
+    good_nums: frozenset
+    avoid_nums: frozenset
+    notes: str = ""
+
+
+def parse_days(text):
+    """Weekday indices (Monday=0) named in free text such as "Tue, Fridays".
+
+    A word counts if it is a weekday name or an abbreviation of one (at
+    least 3 letters), optionally with a plural "s"; "Wednesdays" and "Weds"
+    match, "Wedding" and "Sunny" don't.
+    """
+    days = set()
+    for w in re.findall(r"[A-Za-z]+", str(text or "")):
+        w = w.lower()
+        for stem in (w, w[:-1]) if w.endswith("s") else (w,):
+            if len(stem) >= 3:
+                days.update(i for i, name in enumerate(_WEEKDAY_NAMES) if name.startswith(stem))
+    return frozenset(days)
+
+
+def parse_numbers(text):
+    return frozenset(int(n) for n in re.findall(r"\d+", str(text or "")))
+
+
+def _text(row, col):
+    v = row.get(col, "")
+    return "" if v is None or pd.isna(v) else str(v)
+
+
+def build_guide_rules(df_guide):
+    if df_guide.empty or "Activity" not in df_guide.columns:
+        return {}
+    rules = {}
+    for _, row in df_guide.iterrows():
+        activity = row["Activity"]
+        if not activity or pd.isna(activity) or activity in rules:
+            continue
+        rules[activity] = GuideRule(
+            activity,
+            parse_days(_text(row, "Good Days (Astrology)")),
+            parse_days(_text(row, "Avoid Days (Astrology)")),
+            parse_numbers(_text(row, "Good Numbers (Numerology)")),
+            parse_numbers(_text(row, "Avoid Numbers (Numerology)")),
+            _text(row, "Synergy Notes"),
+        )
+    return rules
+
+
+def guide_rules(snapshot):
+    """{activity: GuideRule}, parsed once per workbook snapshot."""
+    return snapshot.derive(_guide_rules)
+
+
+def _guide_rules(snapshot):
+    return build_guide_rules(snapshot.sheet("Activity_Day_Guide"))
+
+
+def _fit(weekday_or_number, good, avoid):
+    return "Yes" if weekday_or_number in good else ("No" if weekday_or_number in avoid else "Maybe")
+
+
+def day_verdict(rule: GuideRule, d: dt.date, keep_master=True):
+    """(weekday, universal day, astrology fit, numerology fit, verdict) for one date."""
+    wd = d.weekday()
+    ud = universal_day_number(d, keep_master=keep_master)
+    afit = _fit(wd, rule.good_days, rule.avoid_days)
+    nfit = _fit(ud, rule.good_nums, rule.avoid_nums)
+    verdict = "Strong Cosmic Timing" if (afit=="Yes" and nfit=="Yes") else ("Weak / Reschedule Suggested" if ("No" in (afit,nfit)) else "Moderate Timing")
+    return WEEKDAYS[wd], ud, afit, nfit, verdict
+
+
+# --- Vectorized date ranges ---
+
+def date_range(start: dt.date, end: dt.date):
+    return np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+
+
+def weekdays(dates):
+    """Weekday indices (Monday=0) for a datetime64[D] array."""
+    return (np.asarray(dates, dtype="datetime64[D]").astype("int64") + 3) % 7
+
+
+def universal_day_numbers(dates, keep_master=True):
+    """universal_day_number over a datetime64[D] array."""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    year = dates.astype("datetime64[Y]").astype("int64") + 1970
+    month = dates.astype("datetime64[M]").astype("int64") % 12 + 1
+    day = (dates - dates.astype("datetime64[M]")).astype("int64") + 1
+    n = np.zeros(dates.shape, dtype="int64")
+    for part, width in ((year, 4), (month, 2), (day, 2)):
+        for _ in range(width):
+            n += part % 10
+            part = part // 10
+    reduced = np.where(n % 9 == 0, 9, n % 9)
+    if keep_master:
+        reduced = np.where(np.isin(n, (11, 22, 33)), n, reduced)
+    return reduced
+
+
+def _fit_codes(values, good, avoid):
+    # 2 = Yes, 0 = No, 1 = Maybe
+    good_mask = np.isin(values, list(good))
+    avoid_mask = np.isin(values, list(avoid))
+    return np.where(good_mask, 2, np.where(avoid_mask, 0, 1))
+
+
+FIT_LABELS = np.array(["No", "Maybe", "Yes"])
+
+
+def scan_dates(rules, activities, start: dt.date, end: dt.date, keep_master=True):
+    """Score every date in [start, end] for each activity.
+
+    Weekdays and universal day numbers are computed once for the whole range;
+    each activity is then a pair of set-membership masks. Returns one row per
+    (activity, date) ranked best first: Score 2 = Strong, 1 = Moderate,
+    0 = Weak.
+    """
+    dates = date_range(start, end)
+    wd = weekdays(dates)
+    ud = universal_day_numbers(dates, keep_master)
+    frames = []
+    for activity in activities:
+        rule = rules.get(activity)
+        if rule is None:
+            continue
+        afit = _fit_codes(wd, rule.good_days, rule.avoid_days)
+        nfit = _fit_codes(ud, rule.good_nums, rule.avoid_nums)
+        score = np.where((afit == 2) & (nfit == 2), 2, np.where((afit == 0) | (nfit == 0), 0, 1))
+        frames.append(pd.DataFrame({
+            "Date": dates,
+            "Activity": activity,
+            "Weekday": np.array(WEEKDAYS)[wd],
+            "Universal Day": ud,
+            "Astrology Fit": FIT_LABELS[afit],
+            "Numerology Fit": FIT_LABELS[nfit],
+            "Verdict": np.array(VERDICTS)[score],
+            "Score": score,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["Date","Activity","Weekday","Universal Day","Astrology Fit","Numerology Fit","Verdict","Score"])
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(["Score", "Date", "Activity"], ascending=[False, True, True], kind="stable").reset_index(drop=True)
+
+
+def strong_days_by_month(scan):
+    """Activity x month counts of Strong Cosmic Timing dates (a heatmap table)."""
+    strong = scan[scan["Score"] == 2]
+    if strong.empty:
+        return pd.DataFrame()
+    months = pd.to_datetime(strong["Date"]).dt.strftime("%Y-%m")
+    return pd.crosstab(strong["Activity"], months)
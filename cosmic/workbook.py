@@ -0,0 +1,208 @@
+"""Workbook loading and immutable per-upload sheet snapshots.
+
+Workbooks are streamed in openpyxl's read-only mode, one sheet at a time, and
+rejected with WorkbookTooLarge once they exceed these limits:
+
+    COSMIC_MAX_UPLOAD_BYTES   size of the .xlsx file (default 20 MiB)
+    COSMIC_MAX_XML_BYTES      uncompressed size of its parts (default 200 MiB)
+    COSMIC_MAX_SHEET_ROWS     non-empty rows kept from any one sheet (default 50,000)
+    COSMIC_MAX_CELLS          cells kept across all sheets (default 1,000,000)
+"""
+import hashlib
+import os
+import zipfile
+from dataclasses import dataclass, field
+from io import BytesIO
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from . import sheet_cache
+from .metrics import record_cache, timed
+
+# Sheets the app reads; everything else in the workbook is ignored.
+SHEETS = (
+    "Data",
+    "AuditData",
+    "Element_Items",
+    "House_Zones",
+    "Element_Relations",
+    "Element_Preferences",
+    "Shape_Elements",
+    "Activity_Day_Guide",
+)
+
+# Columns a sheet is trimmed to on load. Sheets not listed keep every column:
+# Data and Element_Items are displayed in full, AuditData is all rules and
+# Element_Relations is a matrix.
+SHEET_COLUMNS = {
+    "House_Zones": ("Zone", "Primary Element"),
+    "Element_Preferences": ("Element", "Best Zones"),
+    "Shape_Elements": ("Shape", "Element"),
+    "Activity_Day_Guide": (
+        "Activity",
+        "Good Days (Astrology)",
+        "Avoid Days (Astrology)",
+        "Good Numbers (Numerology)",
+        "Avoid Numbers (Numerology)",
+        "Synergy Notes",
+    ),
+}
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORKBOOK_PATHS = (
+    "data/cosmic_generator_v25.xlsx",
+    os.path.join(_HERE, os.pardir, "data", "cosmic_generator_v25.xlsx"),
+    os.path.join(_HERE, os.pardir, "cosmic_generator_v25.xlsx"),
+)
+
+
+def read_default_workbook() -> bytes:
+    for path in DEFAULT_WORKBOOK_PATHS:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+    raise FileNotFoundError("cosmic_generator_v25.xlsx not found in: " + ", ".join(DEFAULT_WORKBOOK_PATHS))
+
+
+def workbook_key(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+
+class WorkbookTooLarge(ValueError):
+    """The workbook exceeds one of the ingestion limits."""
+
+
+def limits():
+    """(upload bytes, uncompressed bytes, rows per sheet, cells) from the environment."""
+    return (
+        int(os.environ.get("COSMIC_MAX_UPLOAD_BYTES", 20 * 1024 * 1024)),
+        int(os.environ.get("COSMIC_MAX_XML_BYTES", 200 * 1024 * 1024)),
+        int(os.environ.get("COSMIC_MAX_SHEET_ROWS", 50_000)),
+        int(os.environ.get("COSMIC_MAX_CELLS", 1_000_000)),
+    )
+
+
+def _mib(n):
+    return f"{n / (1024 * 1024):.1f} MiB"
+
+
+@timed("workbook.load_workbook_bytes")
+def load_workbook_bytes(b: bytes):
+    """Open the workbook read-only; cells are parsed lazily, sheet by sheet."""
+    max_bytes, max_xml, _, _ = limits()
+    if len(b) > max_bytes:
+        raise WorkbookTooLarge(f"Workbook is {_mib(len(b))}; the limit is {_mib(max_bytes)}.")
+    try:
+        unzipped = sum(info.file_size for info in zipfile.ZipFile(BytesIO(b)).infolist())
+    except zipfile.BadZipFile:
+        unzipped = 0  # let openpyxl report the bad file
+    if unzipped > max_xml:
+        raise WorkbookTooLarge(f"Workbook unpacks to {_mib(unzipped)}; the limit is {_mib(max_xml)}.")
+    return load_workbook(filename=BytesIO(b), read_only=True, data_only=True)
+
+
+@timed("workbook.get_sheet_df")
+def get_sheet_df(wb, name, max_cells=None):
+    """Stream one sheet into a DataFrame, keeping only SHEET_COLUMNS[name] if listed.
+
+    Rows go straight into per-column lists; fully empty rows are dropped
+    and don't count against the row limit.
+    """
+    _, _, max_rows, cell_limit = limits()
+    max_cells = cell_limit if max_cells is None else max_cells
+    try:
+        if not wb or name not in wb.sheetnames:
+            return pd.DataFrame()
+        rows = wb[name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        wanted = SHEET_COLUMNS.get(name)
+        keep = [i for i, h in enumerate(header) if wanted is None or h in wanted]
+        width = len(header)
+        columns = [[] for _ in keep]
+        n_kept = 0
+        for row in rows:
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            values = [row[i] for i in keep]
+            if all(v is None for v in values):
+                continue
+            n_kept += 1
+            # empty rows (e.g. a formatted cell far below the data) don't count;
+            # COSMIC_MAX_XML_BYTES already bounds how many get streamed
+            if n_kept > max_rows:
+                raise WorkbookTooLarge(f"Sheet {name!r} has more than {max_rows:,} rows.")
+            if n_kept * len(keep) > max_cells:
+                limit = f"{max_cells:,} cells"
+                if max_cells < cell_limit:
+                    limit += f" left of the {cell_limit:,}-cell workbook limit"
+                raise WorkbookTooLarge(f"Sheet {name!r} has more than {limit}.")
+            for column, v in zip(columns, values):
+                column.append(v)
+        df = pd.DataFrame(dict(enumerate(columns)), columns=range(len(keep)))
+        df.columns = pd.Index([header[i] for i in keep])
+        return df.infer_objects()
+    except WorkbookTooLarge:
+        raise
+    except Exception:
+        return pd.DataFrame()
+
+
+@dataclass(frozen=True)
+class WorkbookSnapshot:
+    """Parsed sheets of one workbook, keyed by the sha256 of its bytes.
+
+    Snapshots are shared across sessions, so the frames must be treated as
+    read-only; copy before modifying.
+    """
+    key: str
+    sheets: Mapping[str, pd.DataFrame]
+    _derived: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def sheet(self, name: str) -> pd.DataFrame:
+        df = self.sheets.get(name)
+        return df if df is not None else pd.DataFrame()
+
+    def derive(self, factory: Callable[["WorkbookSnapshot"], object]):
+        """Return factory(self), computed once per snapshot and then shared."""
+        try:
+            value = self._derived[factory]
+        except KeyError:
+            record_cache("snapshot.derive", False)
+            with timed(f"derive.{getattr(factory, '__qualname__', factory)}"):
+                return self._derived.setdefault(factory, factory(self))
+        record_cache("snapshot.derive", True)
+        return value
+
+
+def build_snapshot(b: bytes, key: str = None) -> WorkbookSnapshot:
+    wb = load_workbook_bytes(b) if b else None
+    sheets, cells = {}, limits()[3]
+    try:
+        for name in SHEETS:
+            sheets[name] = df = get_sheet_df(wb, name, max_cells=cells)
+            cells -= df.size
+    finally:
+        if wb is not None:
+            wb.close()
+    return WorkbookSnapshot(key or workbook_key(b or b""), MappingProxyType(sheets))
+
+
+def open_snapshot(b: bytes, key: str = None, use_cache: bool = True) -> WorkbookSnapshot:
+    """Like build_snapshot, but served from/written to the on-disk sheet cache."""
+    key = key or workbook_key(b or b"")
+    if use_cache and b:
+        with timed("sheet_cache.read"):
+            sheets = sheet_cache.read_sheets(key)
+        hit = sheets is not None and set(sheets) == set(SHEETS)
+        record_cache("sheet_cache.disk", hit)
+        if hit:
+            return WorkbookSnapshot(key, MappingProxyType(sheets))
+    snapshot = build_snapshot(b, key)
+    if use_cache and b:
+        sheet_cache.write_sheets(key, dict(snapshot.sheets))
+    return snapshot